@@ -1,2 +1,10 @@
-from .application import Application
 from .logic import ComposerTask
+
+
+def __getattr__(name):
+    # Qt загружается только для графического приложения, консольные сценарии обходятся без него
+    if name == "Application":
+        from .application import Application
+
+        return Application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,2 +1,3 @@
 from .curriculum_data import *
-from .orm import *
\ No newline at end of file
+from .orm import *
+from .generator import GeneratorParameters, DatabaseGenerator, generate_database
\ No newline at end of file
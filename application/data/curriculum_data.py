@@ -18,6 +18,8 @@ from .orm import (
     Group,
     Lesson,
     SubjectTitle,
+    TeacherUnavailability,
+    RoomUnavailability,
 )
 from .descriptions import (
     ColumnDescription,
@@ -128,6 +130,34 @@ class Data(SillyDB):
                 SubjectPartition, "subject_partitions", "Дисциплины", represent_subject
             ),
         ),
+        TeacherUnavailability: TableDescription(
+            "Недоступность преподавателей",
+            ForeignKeyColumnDescription(
+                Teacher,
+                "teacher_id",
+                "Преподаватель",
+                represent=lambda obj: f"{obj.last_name} {obj.first_name[0]}. {obj.second_name[0]}.",
+                as_filter=True,
+            ),
+            ForeignKeyColumnDescription(Day, "day_id", "День"),
+            ForeignKeyColumnDescription(
+                Time, "time_id", "Время (пусто — весь день)", nullable=True
+            ),
+        ),
+        RoomUnavailability: TableDescription(
+            "Занятость аудиторий",
+            ForeignKeyColumnDescription(
+                Room,
+                "room_id",
+                "Аудитория",
+                represent=lambda obj: f"к. {obj.building}, а. {obj.room}",
+                as_filter=True,
+            ),
+            ForeignKeyColumnDescription(Day, "day_id", "День"),
+            ForeignKeyColumnDescription(
+                Time, "time_id", "Время (пусто — весь день)", nullable=True
+            ),
+        ),
         Lesson: TableDescription(
             "Расписание",
             ForeignKeyColumnDescription(Group, "group_id", "Группа", as_filter=True),
@@ -182,7 +212,7 @@ class Data(SillyDB):
                     time = Time(value=item)
                     session.add(time)
 
-        session.commit()
+            session.commit()
 
     def make_lesson_types(self):
         with self.get_session() as session:
@@ -208,7 +238,7 @@ class Data(SillyDB):
                     time = Day(value=item)
                     session.add(time)
 
-        session.commit()
+            session.commit()
 
     def __init__(self, db_file_name: str):
         super().__init__(DECLARATIVE_BASE)
@@ -11,6 +11,10 @@ class ForeignKeyColumnDescription(ColumnDescription):
     def orm_type(self):
         return self._orm_type
 
+    @property
+    def nullable(self) -> bool:
+        return self._nullable
+
     @staticmethod
     def represent_by_default(obj: Any):
         if hasattr(obj, "name"):
@@ -24,8 +28,10 @@ class ForeignKeyColumnDescription(ColumnDescription):
 
                  displayed_name: Optional[str] = None,
                  represent: Callable = None,
-                 as_filter = False):
+                 as_filter = False,
+                 nullable = False):
         super().__init__(attribute, displayed_name)
         self._orm_type = orm_type
         self._filter_mode = as_filter
+        self._nullable = nullable
         self.represent = represent if represent else self.represent_by_default
\ No newline at end of file
@@ -0,0 +1,290 @@
+import heapq
+import math
+import os
+import random
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .curriculum_data import Data
+from .orm import (
+    Curriculum,
+    Day,
+    Group,
+    Room,
+    RoomGroup,
+    ScheduledSubject,
+    SubjectPartition,
+    SubjectTitle,
+    Teacher,
+    Time,
+    room_groups_association,
+    room_types_subject_partitions_association,
+    teacher_subject_association,
+)
+
+LECTURE_TYPE_ID = 1
+LABORATORY_TYPE_ID = 3
+LESSON_TYPE_IDS = (1, 2, 3)
+
+Rows = List[Dict[str, object]]
+
+
+class GeneratorParameters:
+    """
+    Size of a synthetic database. Every curriculum gets random subject partitions
+    from the shared pool until each of its groups has tightness * (days * times)
+    lessons a week (laboratory works count twice); every scheduled subject has
+    from lesson_counts[0] to lesson_counts[1] lessons. The teacher pool is sized
+    so that teachers are about as busy as groups: a subject partition is linked to
+    teachers_per_subject teachers or, if its weekly lessons need more, to as many
+    as can give them, and every teacher of the pool teaches something.
+    """
+
+    curricula: int
+    groups_per_curriculum: int
+    subject_partitions: int
+    teachers_per_subject: int
+    room_groups: int
+    rooms: int
+    lesson_counts: Tuple[int, int]
+    tightness: float
+    term_number_id: int
+
+    def __init__(
+        self,
+        curricula: int = 10,
+        groups_per_curriculum: int = 4,
+        subject_partitions: int = 60,
+        teachers_per_subject: int = 2,
+        room_groups: int = 4,
+        rooms: int = 40,
+        lesson_counts: Tuple[int, int] = (1, 2),
+        tightness: float = 0.7,
+        term_number_id: int = 0,
+    ):
+        if min(curricula, groups_per_curriculum, subject_partitions, room_groups) < 1:
+            raise ValueError(
+                "Curricula, groups, subject partitions and room groups are required"
+            )
+        if rooms < room_groups:
+            raise ValueError("Every room group needs at least one room")
+        if not 1 <= lesson_counts[0] <= lesson_counts[1]:
+            raise ValueError(f"Invalid lesson counts: {lesson_counts}")
+        if not 0 < tightness <= 1:
+            raise ValueError("Tightness must be in (0, 1]")
+
+        self.curricula = curricula
+        self.groups_per_curriculum = groups_per_curriculum
+        self.subject_partitions = subject_partitions
+        self.teachers_per_subject = max(teachers_per_subject, 1)
+        self.room_groups = room_groups
+        self.rooms = rooms
+        self.lesson_counts = lesson_counts
+        self.tightness = tightness
+        self.term_number_id = term_number_id
+
+
+class DatabaseGenerator:
+    """
+    Writes a synthetic but valid curriculum database with bulk inserts: all rows are
+    built in memory with explicit ids and inserted table by table with executemany
+    in a single transaction.
+    """
+
+    _parameters: GeneratorParameters
+    _random: random.Random
+
+    def __init__(self, parameters: GeneratorParameters, seed: int = 0):
+        self._parameters = parameters
+        self._random = random.Random(seed)
+
+    def _partitions(self) -> Tuple[Rows, Rows]:
+        titles = []
+        partitions = []
+        for i in range(1, self._parameters.subject_partitions + 1):
+            titles.append({"id": i, "value": f"Дисциплина {i}"})
+            partitions.append(
+                {
+                    "id": i,
+                    "title_id": i,
+                    "lesson_type_id": self._random.choice(LESSON_TYPE_IDS),
+                }
+            )
+        return titles, partitions
+
+    def _curricula(
+        self, partitions: Rows, slot_count: int
+    ) -> Tuple[Rows, Rows, Rows, Dict[int, int]]:
+        parameters = self._parameters
+        weekly_lessons = parameters.tightness * slot_count
+        low, high = parameters.lesson_counts
+
+        curricula = []
+        groups = []
+        scheduled = []
+        # Сколько занятий в неделю ведётся по каждой дисциплине (для нагрузки преподавателей)
+        demand: Dict[int, int] = {}
+
+        for curriculum_id in range(1, parameters.curricula + 1):
+            curricula.append(
+                {"id": curriculum_id, "name": f"Учебный план {curriculum_id}"}
+            )
+            for g in range(parameters.groups_per_curriculum):
+                groups.append(
+                    {
+                        "id": len(groups) + 1,
+                        "curriculum_id": curriculum_id,
+                        "name": f"{curriculum_id}-{g + 1}",
+                    }
+                )
+
+            # Берём с запасом столько дисциплин, сколько может понадобиться
+            draws = min(len(partitions), 2 * math.ceil(weekly_lessons / low) + 8)
+            group_lessons = 0
+            for partition in self._random.sample(partitions, draws):
+                count = self._random.randint(low, high)
+                weight = 2 if partition["lesson_type_id"] == LABORATORY_TYPE_ID else 1
+                if group_lessons + count * weight > weekly_lessons:
+                    continue
+
+                group_lessons += count * weight
+                scheduled.append(
+                    {
+                        "id": len(scheduled) + 1,
+                        "curriculum_id": curriculum_id,
+                        "term_number_id": parameters.term_number_id,
+                        "subject_partition_id": partition["id"],
+                        "count": count,
+                    }
+                )
+                # Лекция проводится для всего потока сразу
+                streams = (
+                    1
+                    if partition["lesson_type_id"] == LECTURE_TYPE_ID
+                    else parameters.groups_per_curriculum
+                )
+                demand[partition["id"]] = (
+                    demand.get(partition["id"], 0) + count * weight * streams
+                )
+                if group_lessons + low > weekly_lessons:
+                    break
+
+        return curricula, groups, scheduled, demand
+
+    def _teachers(
+        self, partitions: Rows, demand: Dict[int, int], slot_count: int
+    ) -> Tuple[Rows, Rows]:
+        parameters = self._parameters
+        capacity = max(parameters.tightness * slot_count, 1)
+        teacher_count = max(
+            math.ceil(sum(demand.values()) / capacity), parameters.teachers_per_subject
+        )
+
+        teachers = [
+            {
+                "id": i,
+                "last_name": f"Преподаватель {i}",
+                "first_name": "Иван",
+                "second_name": "Иванович",
+            }
+            for i in range(1, teacher_count + 1)
+        ]
+
+        # Дисциплины распределяются по наименее загруженным преподавателям, число
+        # преподавателей дисциплины растёт с её нагрузкой
+        load = [(0.0, self._random.random(), teacher["id"]) for teacher in teachers]
+        heapq.heapify(load)
+        links = []
+        for partition in sorted(partitions, key=lambda p: -demand.get(p["id"], 0)):
+            partition_demand = demand.get(partition["id"], 0)
+            count = min(
+                max(
+                    math.ceil(partition_demand / capacity),
+                    parameters.teachers_per_subject,
+                ),
+                len(load),
+            )
+            share = partition_demand / count
+            chosen = [heapq.heappop(load) for _ in range(count)]
+            for teacher_load, _, teacher_id in chosen:
+                links.append({"teacher_id": teacher_id, "subject_id": partition["id"]})
+                heapq.heappush(
+                    load, (teacher_load + share, self._random.random(), teacher_id)
+                )
+        return teachers, links
+
+    def _rooms(self, partitions: Rows) -> Tuple[Rows, Rows, Rows, Rows]:
+        parameters = self._parameters
+        room_groups = [
+            {"id": i, "name": f"Категория {i}"}
+            for i in range(1, parameters.room_groups + 1)
+        ]
+        rooms = []
+        room_links = []
+        for i in range(1, parameters.rooms + 1):
+            rooms.append({"id": i, "building": str((i - 1) // 100 + 1), "room": str(i)})
+            room_links.append(
+                {"room_id": i, "group_id": (i - 1) % parameters.room_groups + 1}
+            )
+
+        partition_links = [
+            {
+                "room_group_id": self._random.randint(1, parameters.room_groups),
+                "subject_id": partition["id"],
+            }
+            for partition in partitions
+        ]
+        return room_groups, rooms, room_links, partition_links
+
+    def write(self, session: Session) -> int:
+        """Inserts everything in one transaction and returns the number of rows."""
+        slot_count = session.query(Day).count() * session.query(Time).count()
+        if slot_count == 0:
+            raise ValueError("The database has no days or times")
+
+        titles, partitions = self._partitions()
+        curricula, groups, scheduled, demand = self._curricula(partitions, slot_count)
+        teachers, teacher_links = self._teachers(partitions, demand, slot_count)
+        room_groups, rooms, room_links, partition_links = self._rooms(partitions)
+
+        tables = (
+            (SubjectTitle.__table__, titles),
+            (SubjectPartition.__table__, partitions),
+            (Curriculum.__table__, curricula),
+            (Group.__table__, groups),
+            (ScheduledSubject.__table__, scheduled),
+            (Teacher.__table__, teachers),
+            (teacher_subject_association, teacher_links),
+            (RoomGroup.__table__, room_groups),
+            (Room.__table__, rooms),
+            (room_groups_association, room_links),
+            (room_types_subject_partitions_association, partition_links),
+        )
+
+        for table, rows in tables:
+            if rows:
+                session.execute(table.insert(), rows)
+        session.commit()
+        return sum(len(rows) for _, rows in tables)
+
+
+def generate_database(
+    path: str,
+    parameters: Optional[GeneratorParameters] = None,
+    seed: int = 0,
+    overwrite: bool = False,
+) -> Tuple[Data, int]:
+    """Creates a new database file at path; returns it and the number of generated rows."""
+    if os.path.exists(path):
+        if not overwrite:
+            raise FileExistsError(path)
+        os.remove(path)
+
+    data = Data(path)
+    data.path = path
+
+    generator = DatabaseGenerator(parameters or GeneratorParameters(), seed)
+    with data.get_session() as session:
+        rows = generator.write(session)
+    return data, rows
@@ -142,3 +142,23 @@ class Lesson(DECLARATIVE_BASE):
     subject_partition_id = Column(Integer, ForeignKey("subject_partitions.id"))
     teacher_id = Column(Integer, ForeignKey("teachers.id"))
     room_id = Column(Integer, ForeignKey("rooms.id"))
+
+class TeacherUnavailability(DECLARATIVE_BASE):
+    __tablename__ = "teacher_unavailability"
+
+    id = Column(Integer, primary_key=True)
+
+    teacher_id = Column(Integer, ForeignKey("teachers.id"))
+    day_id = Column(Integer, ForeignKey("days.id"))
+    # Пустое время — преподаватель недоступен весь день
+    time_id = Column(Integer, ForeignKey("times.id"), nullable=True)
+
+class RoomUnavailability(DECLARATIVE_BASE):
+    __tablename__ = "room_unavailability"
+
+    id = Column(Integer, primary_key=True)
+
+    room_id = Column(Integer, ForeignKey("rooms.id"))
+    day_id = Column(Integer, ForeignKey("days.id"))
+    # Пустое время — аудитория занята весь день
+    time_id = Column(Integer, ForeignKey("times.id"), nullable=True)
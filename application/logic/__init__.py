@@ -1,2 +1,14 @@
-from .composer import ComposerTask
+from .composer import (
+    ComposerTask,
+    term_number_ids,
+    STAGNATION_STOP,
+    STAGNATION_RESTART,
+    INITIALIZATION_RANDOM,
+    INITIALIZATION_GREEDY,
+    INITIALIZATION_COLORING,
+    ENGINE_GENETIC,
+    ENGINE_ANNEALING,
+    ENGINE_TABU,
+    ENGINE_COLORING,
+)
 from .task import ObservableTask
\ No newline at end of file
@@ -1 +1,9 @@
-from .composer import ComposerTask
\ No newline at end of file
+from .composer import ComposerTask
+from .problem import term_number_ids
+from .budget import STAGNATION_STOP, STAGNATION_RESTART
+from .construction import (
+    INITIALIZATION_RANDOM,
+    INITIALIZATION_GREEDY,
+    INITIALIZATION_COLORING,
+)
+from .engines import ENGINE_GENETIC, ENGINE_ANNEALING, ENGINE_TABU, ENGINE_COLORING
\ No newline at end of file
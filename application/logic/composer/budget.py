@@ -0,0 +1,103 @@
+"""
+Stopping rules of the composer besides the generation count. With a time limit the
+generation count may be zero. The limit covers a whole ComposerTask run, also
+when it is split into subproblems: see decomposition.py.
+"""
+
+import sys
+import time
+from typing import Optional
+
+STAGNATION_STOP = "stop"
+STAGNATION_RESTART = "restart"
+STAGNATION_ACTIONS = (STAGNATION_STOP, STAGNATION_RESTART)
+
+UNLIMITED = sys.maxsize
+
+# Нулевой лимит времени означает его отсутствие, исчерпанный заменяется минимальным
+MIN_TIME_LIMIT = 1e-3
+
+
+class SearchBudget:
+    """
+    Stopping rules of an anytime run besides the generation count: a wall-clock time
+    limit and stagnation, i.e. no improvement of the best score for stagnation_limit
+    consecutive generations (or report intervals of single-trajectory engines). On
+    stagnation the engine either stops or restarts its search keeping the best
+    schedule. Zero limits are disabled.
+    """
+
+    time_limit: float
+    stagnation_limit: int
+    on_stagnation: str
+    restarts: int
+
+    def __init__(
+        self,
+        time_limit: float = 0,
+        stagnation_limit: int = 0,
+        on_stagnation: str = STAGNATION_STOP,
+    ):
+        if on_stagnation not in STAGNATION_ACTIONS:
+            raise ValueError(f"Unknown stagnation action: {on_stagnation}")
+        self.time_limit = max(time_limit, 0)
+        self.stagnation_limit = max(stagnation_limit, 0)
+        self.on_stagnation = on_stagnation
+        self.start()
+
+    def start(self):
+        self._started = time.monotonic()
+        self._best_score: Optional[int] = None
+        self._stagnant = 0
+        self.restarts = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    @property
+    def limited(self) -> bool:
+        """Whether the budget alone guarantees that a run ends."""
+        return self.time_limit > 0 or (
+            self.stagnation_limit > 0 and self.on_stagnation == STAGNATION_STOP
+        )
+
+    def cap(self, time_limit: float):
+        """
+        Shortens the time limit to time_limit seconds, e.g. to the share of a longer
+        run left for this search. An exhausted share still gives a minimal limit,
+        so the engine returns its first schedule at once.
+        """
+        time_limit = max(time_limit, MIN_TIME_LIMIT)
+        if self.time_limit == 0 or time_limit < self.time_limit:
+            self.time_limit = time_limit
+
+    def expired(self) -> bool:
+        return self.time_limit > 0 and self.elapsed >= self.time_limit
+
+    def stagnated(self, best_score: int) -> bool:
+        """
+        Records the best score of a generation; True once it has not improved for
+        stagnation_limit generations. The counter then starts over, so a restarted
+        search gets the same patience.
+        """
+        if self._best_score is None or best_score > self._best_score:
+            self._best_score = best_score
+            self._stagnant = 0
+            return False
+
+        self._stagnant += 1
+        if self.stagnation_limit == 0 or self._stagnant < self.stagnation_limit:
+            return False
+
+        self._stagnant = 0
+        if self.on_stagnation == STAGNATION_RESTART:
+            self.restarts += 1
+        return True
+
+    @property
+    def restart_on_stagnation(self) -> bool:
+        return self.on_stagnation == STAGNATION_RESTART
+
+    def __str__(self):
+        return f"{self.elapsed:.1f} s, restarts {self.restarts}"
@@ -0,0 +1,61 @@
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+DEFAULT_CACHE_SIZE = 4096
+
+
+def fingerprint(schedule: Iterable) -> int:
+    """Cheap hash of a genome: only the placement of every gene matters."""
+    return hash(
+        tuple(
+            (lesson.day_id, lesson.time_id, lesson.teacher_id, lesson.room_id)
+            for lesson in schedule
+        )
+    )
+
+
+class FitnessCache:
+    """
+    Bounded LRU cache of fitness values keyed by genome fingerprint, so that
+    duplicate children are never evaluated twice.
+    """
+
+    _scores: "OrderedDict[int, int]"
+    _max_size: int
+    hits: int
+    misses: int
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self._scores = OrderedDict()
+        self._max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._scores)
+
+    def get(self, key: int) -> Optional[int]:
+        score = self._scores.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._scores.move_to_end(key)
+        return score
+
+    def put(self, key: int, score: int):
+        self._scores[key] = score
+        if len(self._scores) > self._max_size:
+            self._scores.popitem(last=False)
+
+    def get_or_evaluate(self, schedule, evaluate: Callable[[object], int]) -> int:
+        key = fingerprint(schedule)
+        score = self.get(key)
+        if score is None:
+            score = evaluate(schedule)
+            self.put(key, score)
+        return score
+
+    def __str__(self):
+        return f"cache hits {self.hits}, misses {self.misses}"
@@ -0,0 +1,271 @@
+"""
+GA checkpoints: with a checkpoint interval the GA saves its population next to
+the database every checkpoint_interval generations, and with resume it continues
+from that checkpoint, e.g. ComposerTask(data, ..., resume=True).execute() or
+composer.py --resume. Subproblems get a checkpoint file each.
+"""
+
+import logging
+import os
+import pickle
+import struct
+import threading
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+from .parallel import decode_schedule, encode_schedule
+from .problem import LessonPrecursor, ProblemSnapshot
+
+CHECKPOINT_SUFFIX = ".checkpoint"
+DEFAULT_CHECKPOINT_INTERVAL = 25
+
+# Популяция списков расписаний (идентификаторы) или векторизованная (индексы)
+LAYOUT_SCHEDULES = 0
+LAYOUT_GENOMES = 1
+
+_MAGIC = b"MMSC"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHBIiqIII")
+
+
+def checkpoint_path(database_path: str) -> Path:
+    """The checkpoint file lives next to the database: curriculum.db -> curriculum.checkpoint."""
+    return Path(database_path).with_suffix(CHECKPOINT_SUFFIX)
+
+
+def problem_key(problem: ProblemSnapshot) -> int:
+    """Checksum of the problem, so that a checkpoint is never applied to other data."""
+    return zlib.crc32(
+        repr(
+            (
+                problem.day_ids,
+                problem.time_ids,
+                [
+                    (
+                        lesson.group_ids,
+                        lesson.subject_partition_id,
+                        lesson.teacher_ids,
+                        lesson.room_ids,
+                        lesson.slots,
+                    )
+                    for lesson in problem.lessons
+                ],
+            )
+        ).encode()
+    )
+
+
+class Checkpoint:
+    """
+    State of a GA run at the start of a generation: the sorted population as packed
+    int32 genes (four per lesson), int64 scores, the pickled RNG state, the generation
+    counter and the best score.
+    """
+
+    problem_key: int
+    layout: int
+    generation: int
+    best_score: int
+    population_size: int
+    lesson_count: int
+    rng_state: bytes
+    genomes: bytes
+    scores: bytes
+
+    def __init__(
+        self,
+        problem_key: int,
+        layout: int,
+        generation: int,
+        best_score: int,
+        population_size: int,
+        lesson_count: int,
+        rng_state: bytes,
+        genomes: bytes,
+        scores: bytes,
+    ):
+        self.problem_key = problem_key
+        self.layout = layout
+        self.generation = generation
+        self.best_score = best_score
+        self.population_size = population_size
+        self.lesson_count = lesson_count
+        self.rng_state = rng_state
+        self.genomes = genomes
+        self.scores = scores
+
+    @classmethod
+    def of_schedules(
+        cls,
+        problem: ProblemSnapshot,
+        generation: int,
+        schedules: Sequence[Sequence[LessonPrecursor]],
+        scores: Sequence[int],
+        rng_state: Any,
+    ) -> "Checkpoint":
+        return cls(
+            problem_key(problem),
+            LAYOUT_SCHEDULES,
+            generation,
+            max(scores),
+            len(schedules),
+            len(problem),
+            pickle.dumps(rng_state),
+            b"".join(encode_schedule(schedule) for schedule in schedules),
+            array("q", scores).tobytes(),
+        )
+
+    @classmethod
+    def of_genomes(
+        cls,
+        problem: ProblemSnapshot,
+        generation: int,
+        genomes,
+        scores,
+        rng_state: Any,
+    ) -> "Checkpoint":
+        """From the int32 genomes and int64 scores arrays of a vectorized population."""
+        return cls(
+            problem_key(problem),
+            LAYOUT_GENOMES,
+            generation,
+            int(scores.max()),
+            len(genomes),
+            len(problem),
+            pickle.dumps(rng_state),
+            genomes.tobytes(),
+            scores.tobytes(),
+        )
+
+    def matches(self, problem: ProblemSnapshot, layout: int) -> bool:
+        return self.problem_key == problem_key(problem) and self.layout == layout
+
+    def restore_rng_state(self) -> Any:
+        return pickle.loads(self.rng_state)
+
+    def schedules(self, problem: ProblemSnapshot) -> List[List[LessonPrecursor]]:
+        size = self.lesson_count * 4 * array("i").itemsize
+        return [
+            decode_schedule(problem, self.genomes[start : start + size])
+            for start in range(0, len(self.genomes), size)
+        ]
+
+    def score_list(self) -> List[int]:
+        scores = array("q")
+        scores.frombytes(self.scores)
+        return scores.tolist()
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            self.layout,
+            self.problem_key,
+            self.generation,
+            self.best_score,
+            self.population_size,
+            self.lesson_count,
+            len(self.rng_state),
+        )
+        return header + zlib.compress(self.rng_state + self.genomes + self.scores, 1)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Checkpoint":
+        (
+            magic,
+            version,
+            layout,
+            key,
+            generation,
+            best_score,
+            population_size,
+            lesson_count,
+            rng_size,
+        ) = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a composer checkpoint or unsupported version")
+
+        body = zlib.decompress(data[_HEADER.size :])
+        genomes_size = population_size * lesson_count * 4 * array("i").itemsize
+        genomes_end = rng_size + genomes_size
+        return cls(
+            key,
+            layout,
+            generation,
+            best_score,
+            population_size,
+            lesson_count,
+            body[:rng_size],
+            body[rng_size:genomes_end],
+            body[genomes_end:],
+        )
+
+
+def load_checkpoint(path: Path) -> Optional[Checkpoint]:
+    """The checkpoint stored at path, or None if there is none or it is unreadable."""
+    try:
+        return Checkpoint.from_bytes(Path(path).read_bytes())
+    except FileNotFoundError:
+        return None
+    except (ValueError, struct.error, zlib.error) as error:
+        logging.warning(f"Ignoring checkpoint {path}: {error}")
+        return None
+
+
+class CheckpointWriter:
+    """
+    Writes checkpoints in a background thread so the GA never waits for the disk.
+    Only the latest submitted checkpoint is kept: if the previous one has not been
+    written yet, it is replaced. Files are written to a temporary name and then
+    renamed, so a crash never leaves a half-written checkpoint behind.
+    """
+
+    _path: Path
+    _pending: Optional[Checkpoint]
+    _closed: bool
+
+    def __init__(self, path: Path):
+        self._path = Path(path)
+        self._pending = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, checkpoint: Checkpoint):
+        with self._condition:
+            self._pending = checkpoint
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                checkpoint, self._pending = self._pending, None
+                if checkpoint is None:
+                    return
+            self._write(checkpoint)
+
+    def _write(self, checkpoint: Checkpoint):
+        temporary = self._path.with_name(self._path.name + ".tmp")
+        try:
+            temporary.write_bytes(checkpoint.to_bytes())
+            os.replace(temporary, self._path)
+        except OSError as error:
+            logging.warning(f"Could not write checkpoint {self._path}: {error}")
+
+    def close(self):
+        """Writes the last pending checkpoint and stops the thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def __enter__(self) -> "CheckpointWriter":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
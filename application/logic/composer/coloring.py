@@ -0,0 +1,252 @@
+import heapq
+import random
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .problem import LessonPrecursor, ProblemSnapshot
+
+
+class DsaturConstructor:
+    """
+    Deterministic graph-coloring construction. Every lesson first gets the least
+    loaded of its allowed teachers; lessons sharing a teacher or a group are then
+    connected in a conflict graph which is colored with DSATUR, colors being
+    (day, time) slots, each lesson only taking the slots where its teacher and some
+    room are available. Finally rooms are assigned slot by slot with a bipartite
+    matching over the rooms available there.
+
+    Ties are broken by lesson order, or randomly if an rng is given, which makes
+    the constructor usable as a diverse seed for other engines.
+    """
+
+    _problem: ProblemSnapshot
+    _random: Optional[random.Random]
+
+    def __init__(self, problem: ProblemSnapshot, rng: Optional[random.Random] = None):
+        self._problem = problem
+        self._random = rng
+        self._slots = [
+            (day_id, time_id)
+            for time_id in problem.time_ids
+            for day_id in problem.day_ids
+        ]
+
+    def _noise(self, count: int) -> List[float]:
+        if self._random is None:
+            return [0.0] * count
+        return [self._random.random() for _ in range(count)]
+
+    def _assign_teachers(self) -> List[int]:
+        lessons = self._problem.lessons
+        noise = self._noise(len(lessons))
+        # Преподаватели, недоступные ни в один слот, не назначаются
+        candidates: Dict[int, Tuple[int, ...]] = {}
+        for lesson in lessons:
+            if id(lesson.placement) not in candidates:
+                candidates[id(lesson.placement)] = lesson.placement.available_teachers()
+        order = sorted(
+            range(len(lessons)),
+            key=lambda i: (len(candidates[id(lessons[i].placement)]), noise[i]),
+        )
+
+        load: Dict[int, int] = {}
+        teachers = [0] * len(lessons)
+        for i in order:
+            teacher_id = min(
+                candidates[id(lessons[i].placement)], key=lambda t: load.get(t, 0)
+            )
+            load[teacher_id] = load.get(teacher_id, 0) + 1
+            teachers[i] = teacher_id
+        return teachers
+
+    def _build_graph(self, teachers: Sequence[int]) -> List[Set[int]]:
+        buckets: Dict[tuple, List[int]] = {}
+        for i, lesson in enumerate(self._problem.lessons):
+            buckets.setdefault(("teacher", teachers[i]), []).append(i)
+            for group_id in lesson.group_ids:
+                buckets.setdefault(("group", group_id), []).append(i)
+
+        neighbours = [set() for _ in self._problem.lessons]
+        for bucket in buckets.values():
+            for i in bucket:
+                neighbours[i].update(bucket)
+        for i, lesson_neighbours in enumerate(neighbours):
+            lesson_neighbours.discard(i)
+        return neighbours
+
+    def _allowed_colors(self, teachers: Sequence[int]) -> List[Tuple[int, ...]]:
+        """Per lesson, the slots where its teacher and one of its rooms are available."""
+        allowed: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+        colors = []
+        for lesson, teacher_id in zip(self._problem.lessons, teachers):
+            key = (id(lesson.placement), teacher_id)
+            if key not in allowed:
+                allowed[key] = tuple(
+                    color
+                    for color, (day_id, time_id) in enumerate(self._slots)
+                    if teacher_id in lesson.teachers_at(day_id, time_id)
+                )
+            colors.append(allowed[key])
+        return colors
+
+    def _color(
+        self, neighbours: List[Set[int]], allowed: List[Tuple[int, ...]]
+    ) -> List[int]:
+        slot_count = len(self._slots)
+        colors = [-1] * len(neighbours)
+        neighbour_colors: List[Dict[int, int]] = [{} for _ in neighbours]
+        slot_load = [0] * slot_count
+        noise = self._noise(len(neighbours))
+
+        heap = [
+            (0, -len(lesson_neighbours), noise[i], i)
+            for i, lesson_neighbours in enumerate(neighbours)
+        ]
+        heapq.heapify(heap)
+
+        while heap:
+            saturation, _, _, i = heapq.heappop(heap)
+            if colors[i] >= 0 or -saturation != len(neighbour_colors[i]):
+                continue
+
+            used = neighbour_colors[i]
+            free = [c for c in allowed[i] if c not in used]
+            if free:
+                color = min(free, key=slot_load.__getitem__)
+            else:
+                # Свободных слотов нет: берём слот с наименьшим числом пересечений
+                color = min(allowed[i], key=lambda c: (used[c], slot_load[c]))
+
+            colors[i] = color
+            slot_load[color] += 1
+            for j in neighbours[i]:
+                if colors[j] >= 0:
+                    continue
+                counts = neighbour_colors[j]
+                is_new = color not in counts
+                counts[color] = counts.get(color, 0) + 1
+                if is_new:
+                    heapq.heappush(
+                        heap, (-len(counts), -len(neighbours[j]), noise[j], j)
+                    )
+
+        return colors
+
+    @staticmethod
+    def _match_rooms(room_options: Dict[int, Sequence[int]]) -> Dict[int, int]:
+        """
+        Hopcroft-Karp: lesson index -> room id for as many lessons as possible. A
+        greedy pass matches most lessons at once; each phase then finds the shortest
+        augmenting paths with a BFS and follows them with an explicit stack, so a
+        phase is linear in the number of options and slots of any size never
+        recurse.
+        """
+        lessons = sorted(room_options, key=lambda i: len(room_options[i]))
+        owner: Dict[int, int] = {}
+        matched: Set[int] = set()
+        for lesson in lessons:
+            for room_id in room_options[lesson]:
+                if room_id not in owner:
+                    owner[room_id] = lesson
+                    matched.add(lesson)
+                    break
+
+        while True:
+            free = [lesson for lesson in lessons if lesson not in matched]
+            layer = {lesson: 0 for lesson in free}
+            queue = deque(free)
+            reachable = False
+            while queue:
+                lesson = queue.popleft()
+                for room_id in room_options[lesson]:
+                    other = owner.get(room_id)
+                    if other is None:
+                        reachable = True
+                    elif other not in layer:
+                        layer[other] = layer[lesson] + 1
+                        queue.append(other)
+            if not reachable:
+                break
+
+            augmented = False
+            next_option = dict.fromkeys(layer, 0)
+            for start in free:
+                path = [start]
+                rooms: List[int] = []
+                while path:
+                    lesson = path[-1]
+                    options = room_options[lesson]
+                    k = next_option[lesson]
+                    while k < len(options):
+                        room_id = options[k]
+                        k += 1
+                        other = owner.get(room_id)
+                        if other is None or layer.get(other) == layer[lesson] + 1:
+                            break
+                    else:
+                        # Тупик: урок больше не участвует в этой фазе
+                        next_option[lesson] = k
+                        layer[lesson] = -1
+                        path.pop()
+                        if rooms:
+                            rooms.pop()
+                        continue
+
+                    next_option[lesson] = k
+                    rooms.append(room_id)
+                    if other is not None:
+                        path.append(other)
+                        continue
+                    for path_lesson, path_room in zip(path, rooms):
+                        owner[path_room] = path_lesson
+                    matched.add(start)
+                    augmented = True
+                    break
+            if not augmented:
+                break
+
+        return {lesson: room_id for room_id, lesson in owner.items()}
+
+    def _assign_rooms(self, colors: Sequence[int]) -> List[int]:
+        lessons = self._problem.lessons
+        by_slot: Dict[int, List[int]] = {}
+        for i, color in enumerate(colors):
+            by_slot.setdefault(color, []).append(i)
+
+        rooms = [0] * len(lessons)
+        for color, slot_lessons in by_slot.items():
+            day_id, time_id = self._slots[color]
+            options = {i: lessons[i].rooms_at(day_id, time_id) for i in slot_lessons}
+            matching = self._match_rooms(options)
+            usage: Dict[int, int] = {}
+            for room_id in matching.values():
+                usage[room_id] = 1
+
+            for i in slot_lessons:
+                if i in matching:
+                    rooms[i] = matching[i]
+                    continue
+                room_id = min(options[i], key=lambda r: usage.get(r, 0))
+                usage[room_id] = usage.get(room_id, 0) + 1
+                rooms[i] = room_id
+        return rooms
+
+    def create_schedule(self) -> List[LessonPrecursor]:
+        teachers = self._assign_teachers()
+        colors = self._color(self._build_graph(teachers), self._allowed_colors(teachers))
+        rooms = self._assign_rooms(colors)
+
+        schedule = []
+        for i, lesson in enumerate(self._problem.lessons):
+            day_id, time_id = self._slots[colors[i]]
+            schedule.append(
+                LessonPrecursor(
+                    group_ids=lesson.group_ids,
+                    subject_partition_id=lesson.subject_partition_id,
+                    day_id=day_id,
+                    time_id=time_id,
+                    teacher_id=teachers[i],
+                    room_id=rooms[i],
+                )
+            )
+        return schedule
@@ -1,6 +1,8 @@
 import random
-from typing import Dict, Any, List, Optional, Sequence, Tuple
-from functools import reduce
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Any, Iterable, List, Optional, Sequence
 
 from sqlalchemy.orm import Session
 
@@ -12,53 +14,88 @@ from ...data import (
     Teacher,
     Curriculum,
     SubjectPartition,
-    ScheduledSubject,
     Time,
     Day,
     Group,
     LessonType,
     Room,
 )
-
-LECTURE_ID = 1
-PRACTICE_ID = 2
-LABORATORY_ID = 3
-
-
-class LessonPrecursor:
-    group_ids: Sequence[int]
-    day_id: int
-    time_id: int
-    subject_partition_id: int
-    teacher_id: int
-    room_id: int
-
-    def __init__(
-        self,
-        group_ids: Sequence[int],
-        day_id: int,
-        time_id: int,
-        subject_partition_id: int,
-        teacher_id: int,
-        room_id: int,
-    ):
-        self.group_ids = group_ids
-        self.day_id = day_id
-        self.time_id = time_id
-        self.subject_partition_id = subject_partition_id
-        self.teacher_id = teacher_id
-        self.room_id = room_id
+from .budget import STAGNATION_STOP, SearchBudget
+from .checkpoint import DEFAULT_CHECKPOINT_INTERVAL, checkpoint_path
+from .construction import INITIALIZATION_RANDOM
+from .decomposition import (
+    Subproblem,
+    SubproblemResult,
+    merge_schedules,
+    solve_subproblem,
+    split_components,
+)
+from .engines import (
+    ENGINE_ANNEALING,
+    ENGINE_COLORING,
+    ENGINE_GENETIC,
+    ENGINE_TABU,
+    AnnealingEngine,
+    ColoringEngine,
+    GeneticEngine,
+    SolverEngine,
+    TabuEngine,
+)
+from .fitness import count_conflicts
+from .genetic import GeneticAlgorithm
+from .incremental import IncrementalEvaluator
+from .metrics import PHASE_LOAD, PHASE_SAVE, PhaseMetrics
+from .persistence import SaveReport, save_schedule
+from .problem import LessonPrecursor, ProblemSnapshot
 
 
 class ComposerTask(ObservableTask):
+    """
+    Composes a schedule for the opened database with the chosen solver engine and
+    saves the best one found, also if the run is interrupted; best_schedule holds it
+    meanwhile. Besides the GA parameters the options select the engine and its
+    initialization, bound the run (time_limit, stagnation_limit, on_stagnation, see
+    budget.py), save and resume GA checkpoints (checkpoint.py), fix the seed, time
+    the phases (metrics), narrow it to terms and curricula, and solve independent
+    parts of the problem in subproblem_processes processes (decomposition.py).
+    Single-trajectory engines get population_size * generations_count iterations.
+    """
+
     _curriculum_data: Data
     _session: Session
     _curriculum: Dict[str, Any]
     _population_size: int
     _generations_count: int
     _mutation_rate: float
-    _schedules: List[List[LessonPrecursor]]
     _best_schedule: List[LessonPrecursor]
+    _problem: ProblemSnapshot
+    _genetic: GeneticAlgorithm
+    _processes: int
+    _islands: int
+    _migration_interval: int
+    _local_search_budget: int
+    _vectorized: bool
+    _initialization: str
+    _engine: str
+    _checkpoint_interval: int
+    _resume: bool
+    _time_limit: float
+    _stagnation_limit: int
+    _on_stagnation: str
+    _solver: Optional[SolverEngine]
+    _seed: int
+    _random: random.Random
+    _metrics: Optional[PhaseMetrics]
+    _print_result: bool
+    _save_report: Optional[SaveReport]
+    _term_number_ids: Sequence[int]
+    _curriculum_ids: Optional[Sequence[int]]
+    _subproblem_processes: int
+    _subproblems: Optional[Sequence[Subproblem]]
+    _part_engines: List[SolverEngine]
+    _part_schedules: List[Optional[List[LessonPrecursor]]]
+    _fresh_seed: int
+    _fresh: Optional[List[LessonPrecursor]]
 
     def __init__(
         self,
@@ -66,263 +103,368 @@ class ComposerTask(ObservableTask):
         population_size: int,
         generations_count: int,
         mutation_rate: float,
+        processes: int = 1,
+        islands: int = 1,
+        migration_interval: int = 10,
+        local_search_budget: int = 0,
+        vectorized: bool = False,
+        initialization: str = INITIALIZATION_RANDOM,
+        engine: str = ENGINE_GENETIC,
+        checkpoint_interval: int = 0,
+        resume: bool = False,
+        time_limit: float = 0,
+        stagnation_limit: int = 0,
+        on_stagnation: str = STAGNATION_STOP,
+        seed: Optional[int] = None,
+        metrics: bool = False,
+        print_result: bool = True,
+        term_number_ids: Iterable[int] = (0,),
+        curriculum_ids: Optional[Iterable[int]] = None,
+        subproblem_processes: int = 1,
     ):  
         self._curriculum_data = data
         self._session = self._curriculum_data.get_session()
         self._population_size = int(population_size)
         self._generations_count = int(generations_count)
         self._mutation_rate = mutation_rate
-        self._schedules = []
+        self._processes = max(int(processes), 1)
+        self._islands = max(int(islands), 1)
+        self._migration_interval = max(int(migration_interval), 1)
+        self._local_search_budget = max(int(local_search_budget), 0)
+        self._vectorized = vectorized
+        self._initialization = initialization
+        self._engine = engine
+        self._checkpoint_interval = max(int(checkpoint_interval), 0)
+        self._resume = resume
+        self._time_limit = max(float(time_limit), 0)
+        self._stagnation_limit = max(int(stagnation_limit), 0)
+        self._on_stagnation = on_stagnation
+        self._solver = None
+        self._seed = int(seed) if seed is not None else random.getrandbits(32)
+        self._random = random.Random(self._seed)
+        self._print_result = print_result
+        self._save_report = None
+        self._term_number_ids = tuple(term_number_ids)
+        self._curriculum_ids = (
+            tuple(curriculum_ids) if curriculum_ids is not None else None
+        )
+        self._subproblem_processes = max(int(subproblem_processes), 1)
+        self._subproblems = None
+        self._fresh = None
+        self._metrics = None
+        if metrics:
+            self._metrics = PhaseMetrics()
+            self._metrics.instrument(self, "load_problem", PHASE_LOAD)
+            self._metrics.instrument(self, "save_to_db", PHASE_SAVE)
 
     def _initialize_progress_units(self): ...
 
-    def create_new_schedule(self) -> List[LessonPrecursor]:
-        schedule = []
-        times = self._session.query(Time).all()
-        days = self._session.query(Day).all()
-        for curriculum in self._session.query(Curriculum).all():
-            curriculum: Curriculum = curriculum
-            groups_for_curriculum = (
-                self._session.query(Group).filter_by(curriculum_id=curriculum.id).all()
-            )
-            subjects_for_term = (
-                self._session.query(ScheduledSubject)
-                .filter(
-                    ScheduledSubject.term_number_id == 0,
-                    ScheduledSubject.curriculum_id == curriculum.id,
-                )
-                .all()
-            )
-
-            for subject_for_term in subjects_for_term:
-                subject_for_term: ScheduledSubject = subject_for_term
-
-                subject_itself: Optional[SubjectPartition] = (
-                    self._session.query(SubjectPartition)
-                    .filter_by(id=subject_for_term.subject_partition_id)
-                    .first()
-                )
-
-                if subject_itself is None:
-                    continue
-
-                allowed_teachers = subject_itself.teachers
-                allowed_room_groups = subject_itself.room_groups
-
-                allowed_rooms_list = []
-                for room_group in allowed_room_groups:
-                    lst = room_group.rooms
-                    allowed_rooms_list.append(lst)
-
-                allowed_rooms = list(
-                    reduce(lambda a, b: set(a).intersection(b), allowed_rooms_list)
-                )
+    @property
+    def seed(self) -> int:
+        return self._seed
 
-                lesson_type_id: int = int(subject_itself.lesson_type_id)
-
-                if lesson_type_id == PRACTICE_ID:
-                    for group in groups_for_curriculum:
-                        for i in range(subject_for_term.count):
-                            if subject_itself is not None:
-                                teacher = random.choice(allowed_teachers)
-                                time = random.choice(times)
-                                room = random.choice(allowed_rooms)
-                                day = random.choice(days)
-                                lesson = LessonPrecursor(
-                                    group_ids=(group.id,),
-                                    subject_partition_id=subject_itself.id,
-                                    time_id=time.id,
-                                    teacher_id=teacher.id,
-                                    room_id=room.id,
-                                    day_id=day.id,
-                                )
-                                schedule.append(lesson)
-
-                elif lesson_type_id == LABORATORY_ID:
-                    for group in groups_for_curriculum:
-                        for i in range(subject_for_term.count * 2):
-                            if subject_itself is not None:
-                                teacher = random.choice(allowed_teachers)
-                                time = random.choice(times)
-                                room = random.choice(allowed_rooms)
-                                day = random.choice(days)
-                                lesson = LessonPrecursor(
-                                    group_ids=(group.id,),
-                                    subject_partition_id=subject_itself.id,
-                                    time_id=time.id,
-                                    teacher_id=teacher.id,
-                                    room_id=room.id,
-                                    day_id=day.id,
-                                )
-                                schedule.append(lesson)
-
-                elif lesson_type_id == LECTURE_ID:
-                    group_ids = []
-                    for group in groups_for_curriculum:
-                        group_ids.append(group.id)
-                    group_ids = tuple(group_ids)
-
-                    for i in range(subject_for_term.count):
-                        teacher = random.choice(allowed_teachers)
-                        time = random.choice(times)
-                        room = random.choice(allowed_rooms)
-                        day = random.choice(days)
-                        lesson = LessonPrecursor(
-                            group_ids=group_ids,
-                            subject_partition_id=subject_itself.id,
-                            time_id=time.id,
-                            teacher_id=teacher.id,
-                            room_id=room.id,
-                            day_id=day.id,
-                        )
-                        schedule.append(lesson)
-                else:
-                    ...
-        return schedule
-
-    def mutate(self, schedule):
-        index = random.randint(0, len(schedule) - 1)
-        lesson = schedule[index]
-        subject = (
-            self._session.query(SubjectPartition)
-            .filter_by(id=lesson.subject_partition_id)
-            .first()
+    def load_problem(self) -> ProblemSnapshot:
+        self._problem = ProblemSnapshot.load(
+            self._session, self._term_number_ids, self._curriculum_ids
         )
-
-        if subject is None:
-            return
-
-        teachers = subject.teachers
-
-        allowed_room_groups = subject.room_groups
-
-        allowed_rooms_list = []
-        for room_group in allowed_room_groups:
-            lst = room_group.rooms
-            allowed_rooms_list.append(lst)
-
-        allowed_rooms = list(
-            reduce(lambda a, b: set(a).intersection(b), allowed_rooms_list)
+        self._genetic = GeneticAlgorithm(
+            self._problem,
+            self._mutation_rate,
+            self._random,
+            initialization=self._initialization,
+            local_search_budget=self._local_search_budget,
         )
+        return self._problem
 
-        times = self._session.query(Time).all()
-        days = self._session.query(Day).all()
+    def create_new_schedule(self) -> List[LessonPrecursor]:
+        return self._genetic.create_new_schedule()
 
-        lesson.day = random.choice(days)
-        lesson.teacher = random.choice(teachers)
-        lesson.room = random.choice(allowed_rooms)
-        lesson.time = random.choice(times)
-
-        schedule[index] = lesson
-
-    def check(self, schedule):
-        score = 0
-
-        teacher_for_time = []
-        room_for_time = []
-        group_for_time = []
-
-        for lesson in schedule:
-            room_id = lesson.room_id
-            teacher_id = lesson.teacher_id
-            day_id = lesson.day_id
-            time_id = lesson.time_id
-            subject_id = lesson.subject_partition_id
-            group_ids = lesson.group_ids
-
-            if (teacher_id, day_id, time_id) in teacher_for_time:
-                score -= 1
-            else:
-                teacher_for_time.append((teacher_id, day_id, time_id))
-
-            if (room_id, day_id, time_id) in room_for_time:
-                score -= 1
-                room_for_time.append((room_id, day_id, time_id))
-
-            tuples = tuple((group_id, day_id, time_id) for group_id in group_ids)
-            
-            for group_id in group_ids:
-                if (group_id, day_id, time_id) in group_for_time:
-                    score -= 1
-                else:
-                    for t in tuples:
-                        group_for_time.append(t)
-                    break
-
-        return score
+    def random_gene(self, index: int) -> LessonPrecursor:
+        return self._genetic.random_gene(index)
 
-    def crossover(self, first, second):
-        child = []
-        for i in range(len(first)):
-            value = first[i] if random.random() > 0.5 else second[i]
-            child.append(value)
-        return child
+    def mutate(self, schedule, evaluator: Optional[IncrementalEvaluator] = None):
+        self._genetic.mutate(schedule, evaluator)
 
-    def execute(self) -> ObservableTaskResult:
-        self._schedules = [
-            self.create_new_schedule() for _ in range(self._population_size)
-        ]
+    def check(self, schedule) -> int:
+        return GeneticAlgorithm.check(schedule)
 
-        for generation in range(self._generations_count):
-            self._schedules.sort(
-                key=lambda schedule: self.check(schedule), reverse=True
+    def crossover(self, first, second):
+        return self._genetic.crossover(first, second)
+
+    @property
+    def metrics(self) -> Optional[PhaseMetrics]:
+        return self._metrics
+
+    @property
+    def save_report(self) -> Optional[SaveReport]:
+        return self._save_report
+
+    @property
+    def best_schedule(self) -> Optional[List[LessonPrecursor]]:
+        """The best schedule found so far, also while the engine is still running."""
+        if self._subproblems is not None:
+            return self._merged_schedule()
+        if self._solver is not None and self._solver.best_schedule is not None:
+            return self._solver.best_schedule
+        return getattr(self, "_best_schedule", None)
+
+    def create_budget(self) -> SearchBudget:
+        budget = SearchBudget(
+            self._time_limit, self._stagnation_limit, self._on_stagnation
+        )
+        if self._generations_count <= 0 and not budget.limited:
+            raise ValueError("A generations count or a time limit is required")
+        return budget
+
+    def create_engine(self, part: Optional[int] = None) -> SolverEngine:
+        """
+        The engine for the whole problem or, with part, for the part-th subproblem:
+        the latter gets its own RNG, metrics and checkpoint file.
+        """
+        budget = self.create_budget()
+        rng = self._random
+        metrics = self._metrics
+        if part is not None:
+            rng = random.Random(self._random.getrandbits(64))
+            metrics = PhaseMetrics() if self._metrics is not None else None
+
+        if self._engine == ENGINE_ANNEALING:
+            return AnnealingEngine(
+                self._population_size * self._generations_count,
+                self._population_size,
+                self._initialization,
+                rng,
+                budget=budget,
             )
-
-            self.make_message(
-                f"Generation {generation + 1}: Best fitness {self.check(self._schedules[0])}"
+        if self._engine == ENGINE_TABU:
+            return TabuEngine(
+                self._population_size * self._generations_count,
+                self._population_size,
+                self._initialization,
+                rng,
+                budget=budget,
+            )
+        if self._engine == ENGINE_COLORING:
+            return ColoringEngine(budget=budget)
+        if self._engine == ENGINE_GENETIC:
+            path = None
+            if self._checkpoint_interval > 0 or self._resume:
+                path = checkpoint_path(self._curriculum_data.path)
+                if part is not None:
+                    path = path.with_name(f"{path.stem}-{part + 1}{path.suffix}")
+            return GeneticEngine(
+                self._population_size,
+                self._generations_count,
+                self._mutation_rate,
+                self._processes,
+                self._islands,
+                self._migration_interval,
+                self._local_search_budget,
+                self._vectorized,
+                self._initialization,
+                rng,
+                checkpoint_path=path,
+                checkpoint_interval=self._checkpoint_interval
+                or DEFAULT_CHECKPOINT_INTERVAL,
+                resume=self._resume,
+                budget=budget,
+                metrics=metrics,
             )
+        raise ValueError(f"Unknown solver engine: {self._engine}")
 
-            # Если найдено хорошее решение
-            if (
-                self.check(self._schedules[0]) == 0
-                or generation == self._generations_count - 1
-            ):
-                # self.print_schedule(self._schedules[0])
-                self._best_schedule = self._schedules[0]
-                self.save_to_db()
-                schedule = self._session.query(Lesson).all()
-                self.print_schedule(schedule)
-                break
-
-            # Селекция: берем 50% лучших особей
-            next_generation = self._schedules[: self._population_size // 2]
-
-            # Скрещивание: создаем новое поколение на основе лучших
-            while len(next_generation) < self._population_size:
-                parent1, parent2 = random.sample(
-                    self._schedules[: self._population_size // 2], 2
+    def execute(self) -> ObservableTaskResult:
+        self._random.seed(self._seed)
+        self._subproblems = None
+        self._fresh = None
+        self.make_message(f"Seed {self._seed}")
+        self.load_problem()
+        subproblems = split_components(self._problem)
+        if len(subproblems) > 1:
+            best_schedule = self._solve_subproblems(subproblems)
+            budget = f"{len(subproblems)} subproblems"
+        else:
+            best_schedule = self._solve()
+            budget = str(self._solver.budget)
+
+        conflicts = count_conflicts(best_schedule)
+        self.make_message(
+            f"Best schedule: fitness {conflicts.score} ({conflicts}), "
+            f"{budget}, seed {self._seed}"
+        )
+        self._finish(best_schedule)
+        if self._metrics is not None:
+            self.make_message(str(self._metrics))
+
+        return ObservableTaskResult(self._metrics, None, None, None)
+
+    def _solve(self) -> List[LessonPrecursor]:
+        self._solver = self.create_engine()
+        try:
+            return self._solver.solve(self._problem, self.make_message)
+        except KeyboardInterrupt:
+            if self._solver.best_schedule is None:
+                raise
+            self.make_message("Interrupted, saving the best schedule so far")
+            return self._solver.best_schedule
+
+    def _report_part(self, part: int, count: int, message: str):
+        self.make_message(f"[{part + 1}/{count}] {message}")
+
+    def _solve_subproblems(
+        self, subproblems: Sequence[Subproblem]
+    ) -> List[LessonPrecursor]:
+        count = len(subproblems)
+        largest = max(subproblems, key=len)
+        self.make_message(
+            f"{count} independent subproblems of {len(self._problem)} lessons, "
+            f"the largest: {largest}"
+        )
+        self._subproblems = subproblems
+        self._part_engines = [self.create_engine(part) for part in range(count)]
+        self._part_schedules = [None] * count
+        self._fresh_seed = self._random.getrandbits(64)
+        processes = min(self._subproblem_processes, count)
+
+        if processes > 1:
+            results = self._solve_concurrently(subproblems, processes)
+        else:
+            results = self._solve_sequentially(subproblems)
+
+        for part, (subproblem, result) in enumerate(zip(subproblems, results)):
+            if result is None:
+                self._report_part(part, count, "not solved, a fresh schedule is kept")
+                continue
+            for message in result.messages:
+                self._report_part(part, count, message)
+            schedule = result.schedule(subproblem)
+            self._report_part(
+                part,
+                count,
+                f"fitness {count_conflicts(schedule).score}, {result.budget}",
+            )
+            if self._metrics is not None and result.metrics is not None:
+                self._metrics.merge(result.metrics)
+            self._part_schedules[part] = schedule
+        return self._merged_schedule()
+
+    def _solve_sequentially(
+        self, subproblems: Sequence[Subproblem]
+    ) -> List[Optional[SubproblemResult]]:
+        count = len(subproblems)
+        results: List[Optional[SubproblemResult]] = [None] * count
+        run_budget = self.create_budget()
+        left = sum(map(len, subproblems))
+        try:
+            for part, subproblem in enumerate(subproblems):
+                engine = self._part_engines[part]
+                if run_budget.time_limit > 0:
+                    # Оставшееся время делится между оставшимися подзадачами по размеру
+                    time_left = run_budget.time_limit - run_budget.elapsed
+                    engine.budget.cap(time_left * len(subproblem) / left)
+                left -= len(subproblem)
+                results[part] = solve_subproblem(
+                    engine, subproblem.problem, partial(self._report_part, part, count)
                 )
-                child = self.crossover(parent1, parent2)
-                if random.random() < self._mutation_rate:
-                    self.mutate(child)
-                next_generation.append(child)
-
-            # Замена популяции
-            self._schedules = next_generation
-
-        return ObservableTaskResult(None, None, None, None)
-
-    def save_to_db(self):
-        if self._best_schedule:
-            with self._session as session:
-                session.query(Lesson).delete()
-                session.commit()
-
-                for lesson in self._best_schedule:
-                    lesson: LessonPrecursor = lesson
-
-                    for group_id in lesson.group_ids:
-                        orm_lesson = Lesson(
-                            group_id=group_id,
-                            subject_partition_id=lesson.subject_partition_id,
-                            time_id=lesson.time_id,
-                            teacher_id=lesson.teacher_id,
-                            room_id=lesson.room_id,
-                            day_id=lesson.day_id,
-                        )
-
-                        session.add(orm_lesson)
-                    session.commit()
+                if results[part].interrupted:
+                    raise KeyboardInterrupt()
+                self._part_schedules[part] = results[part].schedule(subproblem)
+        except KeyboardInterrupt:
+            # Решённые части сохраняются, остальные получают свежее расписание
+            self.make_message("Interrupted, saving the best schedules so far")
+        return results
+
+    def _solve_concurrently(
+        self, subproblems: Sequence[Subproblem], processes: int
+    ) -> List[Optional[SubproblemResult]]:
+        self.make_message(f"Solving in {processes} processes")
+        engines = self._part_engines
+        deadline = None
+        if self._time_limit > 0:
+            total = sum(map(len, subproblems))
+            for engine, subproblem in zip(engines, subproblems):
+                engine.budget.cap(
+                    self._time_limit * processes * len(subproblem) / total
+                )
+            deadline = time.time() + self._time_limit
+        # Крупные подзадачи запускаются первыми, мелкие заполняют простаивающие процессы
+        order = sorted(range(len(subproblems)), key=lambda i: -len(subproblems[i]))
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            submitted = {
+                i: executor.submit(
+                    solve_subproblem,
+                    engines[i],
+                    subproblems[i].problem,
+                    None,
+                    deadline,
+                )
+                for i in order
+            }
+            futures = [submitted[i] for i in range(len(subproblems))]
+            try:
+                return [future.result() for future in futures]
+            except KeyboardInterrupt:
+                # Рабочие процессы тоже прерваны и возвращают лучшее найденное
+                self.make_message("Interrupted, collecting the best schedules so far")
+                return [self._interrupted_result(future) for future in futures]
+
+    @staticmethod
+    def _interrupted_result(future) -> Optional[SubproblemResult]:
+        """The result of an interrupted worker, None if it had no schedule yet."""
+        try:
+            return future.result()
+        except (KeyboardInterrupt, Exception):
+            return None
+
+    def _merged_schedule(self) -> List[LessonPrecursor]:
+        """
+        The schedules of the solved subproblems, the best one so far of a running
+        subproblem and a fresh schedule for the others, in the gene order of the
+        whole problem.
+        """
+        schedules = []
+        for part, subproblem in enumerate(self._subproblems):
+            schedule = self._part_schedules[part]
+            if schedule is None:
+                schedule = self._part_engines[part].best_schedule
+            if schedule is None:
+                fresh = self._fresh_schedule()
+                schedule = [fresh[i] for i in subproblem.indexes]
+            schedules.append(schedule)
+        return merge_schedules(self._problem, self._subproblems, schedules)
+
+    def _fresh_schedule(self) -> List[LessonPrecursor]:
+        # Своя ГПСЧ: обращение к best_schedule во время запуска не меняет результат
+        if self._fresh is None:
+            self._fresh = GeneticAlgorithm(
+                self._problem,
+                self._mutation_rate,
+                random.Random(self._fresh_seed),
+                initialization=self._initialization,
+            ).create_new_schedule()
+        return self._fresh
+
+    def _finish(self, best_schedule: List[LessonPrecursor]):
+        self._best_schedule = best_schedule
+        self._save_report = self.save_to_db()
+        if self._print_result:
+            schedule = self._session.query(Lesson).all()
+            self.print_schedule(schedule)
+
+    def save_to_db(
+        self, schedule: Optional[List[LessonPrecursor]] = None
+    ) -> Optional[SaveReport]:
+        """Saves the best schedule, or schedule if given, which then becomes the best."""
+        if schedule is not None:
+            self._best_schedule = schedule
+        if not getattr(self, "_best_schedule", None):
+            return None
+
+        with self._session as session:
+            report = save_schedule(
+                session, self._best_schedule, self._problem.scheduled_group_ids
+            )
+        self.make_message(f"Saved {report}")
+        return report
 
     def print_schedule(self, schedule):
 
@@ -345,11 +487,11 @@ class ComposerTask(ObservableTask):
                     lessons_for_day = tuple(
                         lesson for lesson in lessons if lesson.day_id == day.id
                     )
-                    for time in times:
+                    for lesson_time in times:
                         lessons_for_time = tuple(
                             lesson
                             for lesson in lessons_for_day
-                            if lesson.time_id == time.id
+                            if lesson.time_id == lesson_time.id
                         )
                         for lesson in lessons_for_time:
                             subject = (
@@ -390,6 +532,6 @@ class ComposerTask(ObservableTask):
                             teacher_name = f"{teacher.last_name} {teacher.first_name[0]}.{teacher.second_name[0]}."
                             room_name = f"к.{room.building}, а.{room.room}"
                             print(
-                                f"         {time.value}: {subject.name} ({subject_type.name.lower()}), {teacher_name}, {room_name}"
+                                f"         {lesson_time.value}: {subject.name} ({subject_type.name.lower()}), {teacher_name}, {room_name}"
                             )
             print()
@@ -0,0 +1,133 @@
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .problem import LessonPrecursor, LessonRequirement, ProblemSnapshot
+
+INITIALIZATION_RANDOM = "random"
+INITIALIZATION_GREEDY = "greedy"
+INITIALIZATION_COLORING = "coloring"
+INITIALIZATION_STRATEGIES = (
+    INITIALIZATION_RANDOM,
+    INITIALIZATION_GREEDY,
+    INITIALIZATION_COLORING,
+)
+
+SlotKey = Tuple[int, int, int]
+
+
+class GreedyConstructor:
+    """
+    Builds near-feasible schedules. Lessons are placed most-constrained-first
+    (fewest available placements, most groups), each into the available (day, time,
+    teacher, room) with the fewest clashes according to occupancy indexes of the
+    lessons placed so far. Ties are broken randomly, so every call gives a different schedule.
+    """
+
+    _problem: ProblemSnapshot
+    _random: random.Random
+
+    def __init__(self, problem: ProblemSnapshot, rng: Optional[random.Random] = None):
+        self._problem = problem
+        self._random = rng if rng is not None else random.Random()
+
+    @staticmethod
+    def _tightness(lesson: LessonRequirement) -> Tuple[int, int]:
+        return (
+            len(lesson.slots) * len(lesson.teacher_ids) * len(lesson.room_ids),
+            -len(lesson.group_ids),
+        )
+
+    def _order(self) -> List[int]:
+        lessons = self._problem.lessons
+        noise = [self._random.random() for _ in lessons]
+        return sorted(
+            range(len(lessons)),
+            key=lambda i: (self._tightness(lessons[i]), noise[i]),
+        )
+
+    @staticmethod
+    def _least_busy(
+        ids: Sequence[int], table: Dict[SlotKey, int], day_id: int, time_id: int
+    ) -> Tuple[int, int]:
+        best_id, best_count = ids[0], table.get((ids[0], day_id, time_id), 0)
+        for id_ in ids:
+            count = table.get((id_, day_id, time_id), 0)
+            if count < best_count:
+                best_id, best_count = id_, count
+            if best_count == 0:
+                break
+        return best_id, best_count
+
+    def _shuffled(self, available: Sequence[int], shuffled: List[int]) -> Sequence[int]:
+        """
+        Candidates in random order, so that ties are broken randomly. Slots where the
+        whole domain is available reuse its shuffle made once per lesson.
+        """
+        if len(available) == len(shuffled):
+            return shuffled
+        return self._random.sample(available, len(available))
+
+    def create_schedule(self) -> List[LessonPrecursor]:
+        lessons = self._problem.lessons
+        schedule: List[Optional[LessonPrecursor]] = [None] * len(lessons)
+
+        teachers: Dict[SlotKey, int] = {}
+        rooms: Dict[SlotKey, int] = {}
+        groups: Dict[SlotKey, int] = {}
+
+        for index in self._order():
+            lesson = lessons[index]
+            teacher_ids = self._random.sample(lesson.teacher_ids, len(lesson.teacher_ids))
+            room_ids = self._random.sample(lesson.room_ids, len(lesson.room_ids))
+            slots = self._random.sample(lesson.slots, len(lesson.slots))
+
+            best = None
+            best_cost = None
+            for day_id, time_id in slots:
+                cost = sum(
+                    groups.get((group_id, day_id, time_id), 0)
+                    for group_id in lesson.group_ids
+                )
+                if best_cost is not None and cost >= best_cost:
+                    continue
+
+                teacher_id, teacher_cost = self._least_busy(
+                    self._shuffled(lesson.teachers_at(day_id, time_id), teacher_ids),
+                    teachers,
+                    day_id,
+                    time_id,
+                )
+                room_id, room_cost = self._least_busy(
+                    self._shuffled(lesson.rooms_at(day_id, time_id), room_ids),
+                    rooms,
+                    day_id,
+                    time_id,
+                )
+                cost += teacher_cost + room_cost
+
+                if best_cost is None or cost < best_cost:
+                    best = (day_id, time_id, teacher_id, room_id)
+                    best_cost = cost
+                    if cost == 0:
+                        break
+
+            day_id, time_id, teacher_id, room_id = best
+            teachers[(teacher_id, day_id, time_id)] = (
+                teachers.get((teacher_id, day_id, time_id), 0) + 1
+            )
+            rooms[(room_id, day_id, time_id)] = rooms.get((room_id, day_id, time_id), 0) + 1
+            for group_id in lesson.group_ids:
+                groups[(group_id, day_id, time_id)] = (
+                    groups.get((group_id, day_id, time_id), 0) + 1
+                )
+
+            schedule[index] = LessonPrecursor(
+                group_ids=lesson.group_ids,
+                subject_partition_id=lesson.subject_partition_id,
+                day_id=day_id,
+                time_id=time_id,
+                teacher_id=teacher_id,
+                room_id=room_id,
+            )
+
+        return schedule
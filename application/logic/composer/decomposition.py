@@ -0,0 +1,183 @@
+"""
+Decomposition of a problem into the connected components of its resource-sharing
+graph. ComposerTask solves every component as an independent subproblem with its
+own engine and an RNG drawn from the task one, in up to subproblem_processes
+worker processes, largest first, so search effort grows with the largest
+component rather than with the whole problem.
+
+The time limit covers the whole run: subproblems solved one after another share
+what is left of it by their size, concurrent ones get a share of the processes'
+time and all stop at its end. An interrupted run keeps the solved subproblems and
+the best schedule of the running ones; subproblems not started yet get a fresh
+schedule.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .engines import SolverEngine
+from .metrics import PhaseMetrics
+from .parallel import decode_schedule, encode_schedule
+from .problem import LessonPrecursor, ProblemSnapshot
+
+
+class Subproblem:
+    """
+    Lessons of a problem that share no teacher, room or group with the rest of it:
+    their indexes in the whole problem and the snapshot of just these lessons.
+    Lessons of a subproblem can never conflict with those of another one, so their
+    schedules are merged as they are.
+    """
+
+    indexes: Tuple[int, ...]
+    problem: ProblemSnapshot
+
+    def __init__(self, indexes: Sequence[int], problem: ProblemSnapshot):
+        self.indexes = tuple(indexes)
+        self.problem = problem
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __str__(self):
+        terms = ", ".join(map(str, self.problem.term_number_ids))
+        return (
+            f"{len(self)} lessons of {len(self.problem.curriculum_ids)} curricula, "
+            f"term ids {terms}"
+        )
+
+
+class SubproblemResult:
+    """
+    What a solved subproblem sends back: the packed best schedule, the reports not
+    delivered yet, and whether the run was interrupted.
+    """
+
+    encoded: bytes
+    messages: List[str]
+    budget: str
+    metrics: Optional[PhaseMetrics]
+    interrupted: bool
+
+    def __init__(
+        self,
+        encoded: bytes,
+        messages: List[str],
+        budget: str,
+        metrics: Optional[PhaseMetrics],
+        interrupted: bool = False,
+    ):
+        self.encoded = encoded
+        self.messages = messages
+        self.budget = budget
+        self.metrics = metrics
+        self.interrupted = interrupted
+
+    def schedule(self, subproblem: Subproblem) -> List[LessonPrecursor]:
+        return decode_schedule(subproblem.problem, self.encoded)
+
+
+class ResourceGraph:
+    """
+    The resource-sharing graph of a problem: curricula are linked to every teacher
+    and room their lessons may use. Groups and terms need no nodes of their own, a
+    group belongs to one curriculum. Connected components are kept in a union-find,
+    so building the graph is linear in the size of the lesson domains.
+    """
+
+    _parent: Dict[Tuple[str, int], Tuple[str, int]]
+
+    def __init__(self, problem: ProblemSnapshot):
+        self._parent = {}
+        linked = set()
+        for lesson in problem.lessons:
+            curriculum = ("curriculum", lesson.curriculum_id)
+            self._find(curriculum)
+            # Одинаковые домены у занятий одной дисциплины связываем один раз
+            key = (lesson.curriculum_id, lesson.subject_partition_id)
+            if key in linked:
+                continue
+            linked.add(key)
+            for teacher_id in lesson.teacher_ids:
+                self._union(("teacher", teacher_id), curriculum)
+            for room_id in lesson.room_ids:
+                self._union(("room", room_id), curriculum)
+
+    def _find(self, node: Tuple[str, int]) -> Tuple[str, int]:
+        parent = self._parent
+        root = parent.setdefault(node, node)
+        while parent[root] != root:
+            root = parent[root]
+        while node != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    def _union(self, first: Tuple[str, int], second: Tuple[str, int]):
+        self._parent[self._find(first)] = self._find(second)
+
+    def component(self, curriculum_id: int) -> Tuple[str, int]:
+        """A node identifying the component of the curriculum."""
+        return self._find(("curriculum", curriculum_id))
+
+
+def split_components(problem: ProblemSnapshot) -> List[Subproblem]:
+    """
+    Splits the problem along the connected components of its resource-sharing
+    graph, so curricula that can never compete for a teacher, a room or a group are
+    searched separately. Lessons keep their relative order; subproblems are ordered
+    by their first lesson.
+    """
+    graph = ResourceGraph(problem)
+    indexes: Dict[Tuple[str, int], List[int]] = {}
+    for i, lesson in enumerate(problem.lessons):
+        indexes.setdefault(graph.component(lesson.curriculum_id), []).append(i)
+
+    return [
+        Subproblem(lesson_indexes, problem.subproblem(lesson_indexes))
+        for lesson_indexes in indexes.values()
+    ]
+
+
+def merge_schedules(
+    problem: ProblemSnapshot,
+    subproblems: Sequence[Subproblem],
+    schedules: Sequence[Sequence[LessonPrecursor]],
+) -> List[LessonPrecursor]:
+    """Puts the schedules of the subproblems back into the gene order of the problem."""
+    merged: List[Optional[LessonPrecursor]] = [None] * len(problem)
+    for subproblem, schedule in zip(subproblems, schedules):
+        for index, lesson in zip(subproblem.indexes, schedule):
+            merged[index] = lesson
+    return merged
+
+
+def solve_subproblem(
+    engine: SolverEngine,
+    problem: ProblemSnapshot,
+    report: Optional[Callable[[str], None]] = None,
+    deadline: Optional[float] = None,
+) -> SubproblemResult:
+    """
+    Runs a solver engine on a subproblem, in a worker process or in place. Without
+    report the progress messages are collected and sent back with the result. With
+    a deadline (time.time() of the end of the whole run) the engine's time limit is
+    cut to the time left when the subproblem starts.
+    """
+    if deadline is not None:
+        engine.budget.cap(deadline - time.time())
+    messages: List[str] = []
+    interrupted = False
+    try:
+        schedule = engine.solve(problem, report or messages.append)
+    except KeyboardInterrupt:
+        if engine.best_schedule is None:
+            raise
+        schedule = engine.best_schedule
+        interrupted = True
+    return SubproblemResult(
+        encode_schedule(schedule),
+        messages,
+        str(engine.budget),
+        engine.metrics,
+        interrupted,
+    )
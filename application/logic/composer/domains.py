@@ -0,0 +1,275 @@
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ...data import (
+    Room,
+    RoomGroup,
+    RoomUnavailability,
+    SubjectPartition,
+    SubjectTitle,
+    Teacher,
+    TeacherUnavailability,
+    room_groups_association,
+    room_types_subject_partitions_association,
+    teacher_subject_association,
+)
+
+Domain = Tuple[int, ...]
+Slot = Tuple[int, int]
+
+
+class EmptyDomainError(ValueError):
+    """
+    Scheduled subjects that have no teacher or no room to be given in, or no time at
+    which one of their teachers and one of their rooms are available together.
+    """
+
+    without_teachers: Tuple[int, ...]
+    without_rooms: Tuple[int, ...]
+    without_time: Tuple[int, ...]
+
+    def __init__(
+        self,
+        message: str,
+        without_teachers: Iterable[int],
+        without_rooms: Iterable[int],
+        without_time: Iterable[int] = (),
+    ):
+        super().__init__(message)
+        self.without_teachers = tuple(without_teachers)
+        self.without_rooms = tuple(without_rooms)
+        self.without_time = tuple(without_time)
+
+
+class PlacementDomain:
+    """
+    Where the lessons of a subject may be placed: the (day, time) slots at which at
+    least one of its teachers and one of its rooms are available, and the teachers
+    and rooms available at each of them. Slots without unavailable resources share
+    the full teacher and room tuples.
+    """
+
+    teacher_ids: Domain
+    room_ids: Domain
+    slots: Tuple[Slot, ...]
+    _teachers: Dict[Slot, Domain]
+    _rooms: Dict[Slot, Domain]
+
+    def __init__(
+        self,
+        slots: Sequence[Slot],
+        teacher_ids: Domain,
+        room_ids: Domain,
+        busy_teachers: Optional[Mapping[Slot, Set[int]]] = None,
+        busy_rooms: Optional[Mapping[Slot, Set[int]]] = None,
+    ):
+        self.teacher_ids = teacher_ids
+        self.room_ids = room_ids
+        self._teachers = {}
+        self._rooms = {}
+
+        def available(ids: Domain, busy: Optional[Set[int]]) -> Domain:
+            if not busy:
+                return ids
+            return tuple(id_ for id_ in ids if id_ not in busy)
+
+        for slot in slots:
+            teachers = available(teacher_ids, busy_teachers and busy_teachers.get(slot))
+            rooms = available(room_ids, busy_rooms and busy_rooms.get(slot))
+            if teachers and rooms:
+                self._teachers[slot] = teachers
+                self._rooms[slot] = rooms
+        self.slots = tuple(self._teachers)
+
+    def teachers_at(self, day_id: int, time_id: int) -> Domain:
+        return self._teachers.get((day_id, time_id), ())
+
+    def rooms_at(self, day_id: int, time_id: int) -> Domain:
+        return self._rooms.get((day_id, time_id), ())
+
+    def available_teachers(self) -> Domain:
+        """Teachers available at one of the slots at least."""
+        available = set()
+        for teachers in self._teachers.values():
+            available.update(teachers)
+        return tuple(id_ for id_ in self.teacher_ids if id_ in available)
+
+
+def _busy_slots(
+    session: Session, model, resource, day_ids: Sequence[int], time_ids: Sequence[int]
+) -> Dict[Slot, Set[int]]:
+    """Unavailable resource ids per slot; a row without time covers the whole day."""
+    days = set(day_ids)
+    busy: Dict[Slot, Set[int]] = {}
+    for resource_id, day_id, time_id in session.execute(
+        select(resource, model.day_id, model.time_id)
+    ):
+        if day_id not in days:
+            continue
+        for slot_time_id in time_ids if time_id is None else (time_id,):
+            busy.setdefault((day_id, slot_time_id), set()).add(resource_id)
+    return busy
+
+
+class DomainIndex:
+    """
+    Allowed teacher and room ids of every subject partition, read once per run with
+    three queries over the association tables. A partition may be given in the
+    rooms that belong to every one of its room groups. Domains are sorted tuples,
+    one per partition, shared by all lessons of that partition.
+
+    The teacher and room unavailability tables, read with one query each, prune the
+    domains further into a PlacementDomain per partition, so the composer only ever
+    samples available (day, time, teacher, room) combinations.
+    """
+
+    _teachers: Dict[int, Domain]
+    _rooms: Dict[int, Domain]
+    _slots: Tuple[Slot, ...]
+    _busy_teachers: Dict[Slot, Set[int]]
+    _busy_rooms: Dict[Slot, Set[int]]
+    _placements: Dict[int, PlacementDomain]
+
+    def __init__(
+        self,
+        teachers: Dict[int, Domain],
+        rooms: Dict[int, Domain],
+        slots: Sequence[Slot] = (),
+        busy_teachers: Optional[Dict[Slot, Set[int]]] = None,
+        busy_rooms: Optional[Dict[Slot, Set[int]]] = None,
+    ):
+        self._teachers = teachers
+        self._rooms = rooms
+        self._slots = tuple(slots)
+        self._busy_teachers = busy_teachers or {}
+        self._busy_rooms = busy_rooms or {}
+        self._placements = {}
+
+    @classmethod
+    def load(
+        cls, session: Session, day_ids: Sequence[int], time_ids: Sequence[int]
+    ) -> "DomainIndex":
+        teacher_links = teacher_subject_association.c
+        teachers: Dict[int, Set[int]] = {}
+        for partition_id, teacher_id in session.execute(
+            select(teacher_links.subject_id, teacher_links.teacher_id).join(
+                Teacher.__table__, Teacher.id == teacher_links.teacher_id
+            )
+        ):
+            teachers.setdefault(partition_id, set()).add(teacher_id)
+
+        room_links = room_groups_association.c
+        rooms_of_group: Dict[int, Set[int]] = {}
+        for group_id, room_id in session.execute(
+            select(room_links.group_id, room_links.room_id).join(
+                Room.__table__, Room.id == room_links.room_id
+            )
+        ):
+            rooms_of_group.setdefault(group_id, set()).add(room_id)
+
+        group_links = room_types_subject_partitions_association.c
+        groups: Dict[int, List[int]] = {}
+        for partition_id, group_id in session.execute(
+            select(group_links.subject_id, group_links.room_group_id).join(
+                RoomGroup.__table__, RoomGroup.id == group_links.room_group_id
+            )
+        ):
+            groups.setdefault(partition_id, []).append(group_id)
+
+        rooms: Dict[int, Domain] = {}
+        for partition_id, group_ids in groups.items():
+            allowed = set(rooms_of_group.get(group_ids[0], ()))
+            for group_id in group_ids[1:]:
+                allowed.intersection_update(rooms_of_group.get(group_id, ()))
+            rooms[partition_id] = tuple(sorted(allowed))
+
+        return cls(
+            {
+                partition_id: tuple(sorted(teacher_ids))
+                for partition_id, teacher_ids in teachers.items()
+            },
+            rooms,
+            [(day_id, time_id) for day_id in day_ids for time_id in time_ids],
+            _busy_slots(
+                session,
+                TeacherUnavailability,
+                TeacherUnavailability.teacher_id,
+                day_ids,
+                time_ids,
+            ),
+            _busy_slots(
+                session,
+                RoomUnavailability,
+                RoomUnavailability.room_id,
+                day_ids,
+                time_ids,
+            ),
+        )
+
+    def teacher_ids(self, partition_id: int) -> Domain:
+        return self._teachers.get(partition_id, ())
+
+    def room_ids(self, partition_id: int) -> Domain:
+        return self._rooms.get(partition_id, ())
+
+    def placement(self, partition_id: int) -> PlacementDomain:
+        placement = self._placements.get(partition_id)
+        if placement is None:
+            placement = self._placements[partition_id] = PlacementDomain(
+                self._slots,
+                self.teacher_ids(partition_id),
+                self.room_ids(partition_id),
+                self._busy_teachers,
+                self._busy_rooms,
+            )
+        return placement
+
+    def validate(self, session: Session, partition_ids: Iterable[int]):
+        """
+        Raises EmptyDomainError naming the partitions among partition_ids that have
+        no allowed teacher, no allowed room or no available time, before any search
+        starts.
+        """
+        partition_ids = sorted(set(partition_ids))
+        without_teachers = [i for i in partition_ids if not self.teacher_ids(i)]
+        without_rooms = [i for i in partition_ids if not self.room_ids(i)]
+        without_time = [
+            i
+            for i in partition_ids
+            if self.teacher_ids(i) and self.room_ids(i) and not self.placement(i).slots
+        ]
+        if not without_teachers and not without_rooms and not without_time:
+            return
+
+        names = dict(
+            session.execute(
+                select(SubjectPartition.id, SubjectTitle.value)
+                .join(SubjectTitle, SubjectTitle.id == SubjectPartition.title_id)
+                .where(
+                    SubjectPartition.id.in_(
+                        without_teachers + without_rooms + without_time
+                    )
+                )
+            ).all()
+        )
+
+        def describe(ids: List[int]) -> str:
+            return ", ".join(f"{names.get(i, '?')} (#{i})" for i in ids)
+
+        problems = []
+        if without_teachers:
+            problems.append(f"no teachers: {describe(without_teachers)}")
+        if without_rooms:
+            problems.append(f"no rooms: {describe(without_rooms)}")
+        if without_time:
+            problems.append(
+                f"no time with an available teacher and room: {describe(without_time)}"
+            )
+        raise EmptyDomainError(
+            f"Subjects that cannot be scheduled, {'; '.join(problems)}",
+            without_teachers,
+            without_rooms,
+            without_time,
+        )
@@ -0,0 +1,11 @@
+from .base import (
+    SolverEngine,
+    ENGINE_GENETIC,
+    ENGINE_ANNEALING,
+    ENGINE_TABU,
+    ENGINE_COLORING,
+)
+from .genetic import GeneticEngine
+from .annealing import AnnealingEngine
+from .tabu import TabuEngine
+from .coloring import ColoringEngine
\ No newline at end of file
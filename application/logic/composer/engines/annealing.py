@@ -0,0 +1,85 @@
+import math
+import random
+from typing import Optional
+
+from ..budget import STAGNATION_RESTART, UNLIMITED, SearchBudget
+from ..construction import INITIALIZATION_RANDOM
+from ..genetic import Schedule
+from ..problem import ProblemSnapshot
+from .base import Messenger
+from .trajectory import TrajectoryEngine
+
+DEFAULT_INITIAL_TEMPERATURE = 2.0
+DEFAULT_FINAL_TEMPERATURE = 0.01
+
+
+class AnnealingEngine(TrajectoryEngine):
+    """
+    Simulated annealing over single-gene moves. Worse moves are accepted with
+    probability exp(delta / T); the temperature decreases geometrically from the
+    initial to the final one over the given number of iterations or the time limit,
+    whichever runs out first. A restart starts from a new schedule at the current
+    temperature.
+    """
+
+    def __init__(
+        self,
+        iterations: int,
+        report_interval: int = 100,
+        initialization: str = INITIALIZATION_RANDOM,
+        rng: Optional[random.Random] = None,
+        budget: Optional[SearchBudget] = None,
+        initial_temperature: float = DEFAULT_INITIAL_TEMPERATURE,
+        final_temperature: float = DEFAULT_FINAL_TEMPERATURE,
+    ):
+        super().__init__(iterations, report_interval, initialization, rng, budget)
+        self._initial_temperature = initial_temperature
+        self._final_temperature = final_temperature
+
+    def solve(self, problem: ProblemSnapshot, report: Messenger) -> Schedule:
+        evaluator = self._start(problem)
+        best_schedule = list(evaluator.schedule)
+        best_score = evaluator.score
+        self._keep_best(best_schedule, best_score)
+        if not best_schedule:
+            return best_schedule
+
+        temperature = self._initial_temperature
+        ratio = self._final_temperature / self._initial_temperature
+        time_limit = self.budget.time_limit
+
+        for iteration in range(1, self._iterations + 1):
+            if best_score == 0:
+                break
+
+            progress = 0.0
+            if self._iterations < UNLIMITED:
+                progress = iteration / self._iterations
+            if time_limit > 0:
+                progress = max(progress, self.budget.elapsed / time_limit)
+            temperature = self._initial_temperature * ratio ** min(progress, 1.0)
+
+            index = self._pick_lesson(evaluator)
+            score = evaluator.score
+            move = evaluator.apply_move(index, self._genetic.random_gene(index))
+            delta = evaluator.score - score
+
+            if delta < 0 and self._random.random() >= math.exp(delta / temperature):
+                evaluator.undo_move(move)
+            elif evaluator.score > best_score:
+                best_score = evaluator.score
+                best_schedule = list(evaluator.schedule)
+                self._keep_best(best_schedule, best_score)
+
+            if iteration % self._report_interval == 0:
+                report(
+                    f"Iteration {iteration}: Best fitness {best_score}, "
+                    f"current {evaluator.score}, temperature {temperature:.3f}"
+                )
+                verdict = self._budget_verdict(best_score, report)
+                if verdict == STAGNATION_RESTART:
+                    evaluator = self._restart()
+                elif verdict is not None:
+                    break
+
+        return best_schedule
@@ -0,0 +1,70 @@
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional
+
+from ..budget import STAGNATION_RESTART, STAGNATION_STOP, SearchBudget
+from ..metrics import PhaseMetrics
+from ..problem import LessonPrecursor, ProblemSnapshot
+
+ENGINE_GENETIC = "genetic"
+ENGINE_ANNEALING = "annealing"
+ENGINE_TABU = "tabu"
+ENGINE_COLORING = "coloring"
+
+Messenger = Callable[[str], None]
+
+
+class SolverEngine(ABC):
+    """
+    A search strategy of the composer. Engines work on a problem snapshot only,
+    report progress through the messenger and return the best schedule found;
+    saving it is left to ComposerTask. The best schedule so far is also kept in
+    best_schedule, so it can be saved even if a run is interrupted.
+    """
+
+    budget: SearchBudget
+    best_schedule: Optional[List[LessonPrecursor]]
+    best_score: Optional[int]
+
+    def __init__(self, budget: Optional[SearchBudget] = None):
+        self.budget = budget if budget is not None else SearchBudget()
+        self.best_schedule = None
+        self.best_score = None
+
+    @property
+    def metrics(self) -> Optional[PhaseMetrics]:
+        """Phase timings, for the engines that collect them."""
+        return None
+
+    @abstractmethod
+    def solve(
+        self, problem: ProblemSnapshot, report: Messenger
+    ) -> List[LessonPrecursor]:
+        raise NotImplementedError()
+
+    def _improves(self, score: int) -> bool:
+        return self.best_score is None or score > self.best_score
+
+    def _keep_best(self, schedule: List[LessonPrecursor], score: int):
+        if self._improves(score):
+            self.best_schedule = schedule
+            self.best_score = score
+
+    def _budget_verdict(
+        self, best_score: int, report: Messenger, can_restart: bool = True
+    ) -> Optional[str]:
+        """
+        None while the search may go on, otherwise STAGNATION_STOP or
+        STAGNATION_RESTART; the reason is reported.
+        """
+        budget = self.budget
+        if budget.expired():
+            report(f"Time limit of {budget.time_limit:g} s reached ({budget})")
+            return STAGNATION_STOP
+        if not budget.stagnated(best_score):
+            return None
+
+        if budget.restart_on_stagnation and can_restart:
+            report(f"No improvement for {budget.stagnation_limit} generations, restarting")
+            return STAGNATION_RESTART
+        report(f"No improvement for {budget.stagnation_limit} generations, stopping ({budget})")
+        return STAGNATION_STOP
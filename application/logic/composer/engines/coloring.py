@@ -0,0 +1,37 @@
+import random
+import time
+from typing import Optional
+
+from ..budget import SearchBudget
+from ..coloring import DsaturConstructor
+from ..fitness import count_conflicts
+from ..genetic import Schedule
+from ..problem import ProblemSnapshot
+from .base import Messenger, SolverEngine
+
+
+class ColoringEngine(SolverEngine):
+    """
+    One pass of DSATUR graph coloring followed by room matching. Deterministic unless
+    an rng is given; gives a feasible or near-feasible schedule almost instantly.
+    """
+
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        budget: Optional[SearchBudget] = None,
+    ):
+        super().__init__(budget)
+        self._random = rng
+
+    def solve(self, problem: ProblemSnapshot, report: Messenger) -> Schedule:
+        self.budget.start()
+        start = time.monotonic()
+        schedule = DsaturConstructor(problem, self._random).create_schedule()
+        conflicts = count_conflicts(schedule)
+        self._keep_best(schedule, conflicts.score)
+        report(
+            f"DSATUR: fitness {conflicts.score} ({conflicts}), "
+            f"{len(schedule)} lessons in {time.monotonic() - start:.3f} s"
+        )
+        return schedule
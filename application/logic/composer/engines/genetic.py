@@ -0,0 +1,462 @@
+import random
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..budget import STAGNATION_RESTART, UNLIMITED, SearchBudget
+from ..cache import FitnessCache, fingerprint
+from ..checkpoint import (
+    DEFAULT_CHECKPOINT_INTERVAL,
+    LAYOUT_GENOMES,
+    LAYOUT_SCHEDULES,
+    Checkpoint,
+    CheckpointWriter,
+    load_checkpoint,
+)
+from ..construction import INITIALIZATION_RANDOM
+from ..fitness import ConflictReport, count_conflicts
+from ..genetic import GeneticAlgorithm, Schedule, sort_population
+from ..islands import IslandModel
+from ..metrics import (
+    PHASE_CROSSOVER,
+    PHASE_FITNESS,
+    PHASE_INIT,
+    PHASE_LOCAL_SEARCH,
+    PHASE_MUTATION,
+    PHASE_SELECTION,
+    PhaseMetrics,
+)
+from ..parallel import ParallelEvaluator
+from ..problem import ProblemSnapshot
+from ..shared import SharedMemoryEvaluator, SharedPopulationBuffer
+from ..vectorized import (
+    GENE_WIDTH,
+    GenomeEncoding,
+    VectorizedPopulation,
+    count_population_conflicts,
+)
+from .base import Messenger, SolverEngine
+
+
+class GeneticEngine(SolverEngine):
+    """
+    The composer genetic algorithm: a single population (optionally scored in a process
+    pool), an island model, or the vectorized NumPy population.
+
+    With a checkpoint path the single and the vectorized population are saved there
+    every checkpoint_interval generations (and at the end); with resume the run
+    continues from that file if it matches the problem. Island runs keep their RNG
+    states in the workers and are not checkpointed.
+
+    A zero generations count means no generation limit, the budget must then end
+    the run. On stagnation the population is refilled around its best schedule;
+    island runs can only stop.
+
+    With metrics the operators are instrumented phase by phase; island runs happen
+    in worker processes and are not measured.
+    """
+
+    _population_size: int
+    _generations_count: int
+    _mutation_rate: float
+    _processes: int
+    _islands: int
+    _migration_interval: int
+    _local_search_budget: int
+    _vectorized: bool
+    _initialization: str
+    _genetic: GeneticAlgorithm
+    _fitness_cache: FitnessCache
+    _evaluator: Optional[ParallelEvaluator]
+    _random: random.Random
+    _checkpoint_path: Optional[Path]
+    _checkpoint_interval: int
+    _resume: bool
+    _checkpoints: Optional[CheckpointWriter]
+    _metrics: Optional[PhaseMetrics]
+    _instrumented: bool
+
+    def __init__(
+        self,
+        population_size: int,
+        generations_count: int,
+        mutation_rate: float,
+        processes: int = 1,
+        islands: int = 1,
+        migration_interval: int = 10,
+        local_search_budget: int = 0,
+        vectorized: bool = False,
+        initialization: str = INITIALIZATION_RANDOM,
+        rng: Optional[random.Random] = None,
+        checkpoint_path: Optional[Path] = None,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+        resume: bool = False,
+        budget: Optional[SearchBudget] = None,
+        metrics: Optional[PhaseMetrics] = None,
+    ):
+        super().__init__(budget)
+        self._population_size = population_size
+        self._generations_count = generations_count
+        self._mutation_rate = mutation_rate
+        self._processes = processes
+        self._islands = islands
+        self._migration_interval = migration_interval
+        self._local_search_budget = local_search_budget
+        self._vectorized = vectorized
+        self._initialization = initialization
+        self._evaluator = None
+        self._random = rng if rng is not None else random.Random()
+        self._checkpoint_path = checkpoint_path
+        self._checkpoint_interval = max(checkpoint_interval, 1)
+        self._resume = resume
+        self._checkpoints = None
+        self._metrics = metrics
+        self._instrumented = False
+
+    @property
+    def metrics(self) -> Optional[PhaseMetrics]:
+        return self._metrics
+
+    def solve(self, problem: ProblemSnapshot, report: Messenger) -> Schedule:
+        self.budget.start()
+        if self._metrics is not None and not self._instrumented:
+            # Не в конструкторе: до запуска движок должен оставаться сериализуемым
+            self._metrics.instrument(self, "_evaluate_all", PHASE_FITNESS)
+            self._metrics.instrument(self, "_sort", PHASE_SELECTION)
+            self._metrics.instrument(self, "_create_population", PHASE_INIT)
+            self._instrumented = True
+        self._genetic = GeneticAlgorithm(
+            problem,
+            self._mutation_rate,
+            self._random,
+            initialization=self._initialization,
+            local_search_budget=self._local_search_budget,
+        )
+        if self._metrics is not None:
+            self._instrument_genetic()
+        if self._islands > 1 and not self._vectorized:
+            return self._solve_islands(problem, report)
+
+        if self._checkpoint_path is not None:
+            self._checkpoints = CheckpointWriter(self._checkpoint_path)
+        try:
+            if self._vectorized:
+                return self._solve_vectorized(problem, report)
+
+            if self._processes > 1:
+                self._evaluator = ParallelEvaluator(problem, self._processes)
+            return self._solve_population(problem, report)
+        finally:
+            if self._evaluator is not None:
+                self._evaluator.shutdown()
+                self._evaluator = None
+            if self._checkpoints is not None:
+                self._checkpoints.close()
+                self._checkpoints = None
+
+    def _instrument_genetic(self):
+        metrics = self._metrics
+        if not self._vectorized:
+            metrics.instrument(self._genetic, "create_new_schedule", PHASE_INIT)
+        metrics.instrument(self._genetic, "crossover", PHASE_CROSSOVER)
+        metrics.instrument(self._genetic, "mutate", PHASE_MUTATION)
+        if self._genetic.local_search is not None:
+            metrics.instrument(self._genetic.local_search, "improve", PHASE_LOCAL_SEARCH)
+
+    def _instrument_population(self, population: VectorizedPopulation):
+        metrics = self._metrics
+        metrics.instrument(population, "_evaluate_range", PHASE_FITNESS)
+        metrics.instrument(population, "sort", PHASE_SELECTION)
+        metrics.instrument(population, "crossover", PHASE_CROSSOVER)
+        metrics.instrument(population, "mutate", PHASE_MUTATION)
+
+    @staticmethod
+    def _sort(
+        schedules: List[Schedule], scores: List[int]
+    ) -> Tuple[List[Schedule], List[int]]:
+        return sort_population(schedules, scores)
+
+    def _create_population(self, *args, **kwargs) -> VectorizedPopulation:
+        population = VectorizedPopulation(*args, **kwargs)
+        if self._metrics is not None:
+            self._instrument_population(population)
+        return population
+
+    def _load_checkpoint(
+        self, problem: ProblemSnapshot, layout: int, report: Messenger
+    ) -> Optional[Checkpoint]:
+        if not self._resume or self._checkpoint_path is None:
+            return None
+
+        checkpoint = load_checkpoint(self._checkpoint_path)
+        if checkpoint is None:
+            report(f"No usable checkpoint at {self._checkpoint_path}, starting over")
+            return None
+        if (
+            not checkpoint.matches(problem, layout)
+            or checkpoint.population_size != self._population_size
+        ):
+            report(
+                f"Checkpoint {self._checkpoint_path} does not match the data "
+                f"or the population size, starting over"
+            )
+            return None
+
+        report(
+            f"Resuming from generation {checkpoint.generation + 1}: "
+            f"best fitness {checkpoint.best_score}"
+        )
+        return checkpoint
+
+    @property
+    def _generation_limit(self) -> int:
+        return self._generations_count if self._generations_count > 0 else UNLIMITED
+
+    def _should_checkpoint(self, generation: int) -> bool:
+        return (
+            self._checkpoints is not None
+            and generation > 0
+            and generation % self._checkpoint_interval == 0
+        )
+
+    def _evaluate_all(self, schedules: List[Schedule]) -> List[int]:
+        """
+        Scores schedules through the fitness cache; schedules missing from it are
+        evaluated in one batch, in the process pool if there is one.
+        """
+        scores: List[Optional[int]] = [None] * len(schedules)
+        missing: Dict[int, List[int]] = {}
+        for i, schedule in enumerate(schedules):
+            key = fingerprint(schedule)
+            if key in missing:
+                missing[key].append(i)
+                continue
+
+            scores[i] = self._fitness_cache.get(key)
+            if scores[i] is None:
+                missing[key] = [i]
+
+        if missing:
+            batch = [schedules[indexes[0]] for indexes in missing.values()]
+            if self._evaluator is not None:
+                batch_scores = self._evaluator.evaluate(batch)
+            else:
+                batch_scores = [self._genetic.check(schedule) for schedule in batch]
+
+            for (key, indexes), score in zip(missing.items(), batch_scores):
+                self._fitness_cache.put(key, score)
+                for i in indexes:
+                    scores[i] = score
+
+        return scores
+
+    def _solve_population(self, problem: ProblemSnapshot, report: Messenger) -> Schedule:
+        self._fitness_cache = FitnessCache()
+        first_generation = 0
+        checkpoint = self._load_checkpoint(problem, LAYOUT_SCHEDULES, report)
+        if checkpoint is not None:
+            schedules = checkpoint.schedules(problem)
+            scores = checkpoint.score_list()
+            self._random.setstate(checkpoint.restore_rng_state())
+            first_generation = checkpoint.generation
+        else:
+            schedules = [
+                self._genetic.create_new_schedule()
+                for _ in range(self._population_size)
+            ]
+            scores = self._evaluate_all(schedules)
+
+        generation = first_generation
+        for generation in range(first_generation, self._generation_limit):
+            schedules, scores = self._sort(schedules, scores)
+            if self._should_checkpoint(generation):
+                self._checkpoints.submit(
+                    Checkpoint.of_schedules(
+                        problem, generation, schedules, scores, self._random.getstate()
+                    )
+                )
+
+            conflicts = count_conflicts(schedules[0])
+            message = (
+                f"Generation {generation + 1}: Best fitness {conflicts.score} ({conflicts}), "
+                f"{self._fitness_cache}"
+            )
+            if self._genetic.local_search is not None:
+                message += f", repaired {self._genetic.local_search.take_repaired()}"
+            report(message)
+            self._keep_best(schedules[0], scores[0])
+
+            # Если найдено хорошее решение
+            if conflicts.score == 0 or generation == self._generation_limit - 1:
+                break
+
+            verdict = self._budget_verdict(scores[0], report)
+            if verdict == STAGNATION_RESTART:
+                # Перезапуск: оставляем лучшее расписание, остальные строим заново
+                fresh = [
+                    self._genetic.create_new_schedule()
+                    for _ in range(len(schedules) - 1)
+                ]
+                schedules = schedules[:1] + fresh
+                scores = scores[:1] + self._evaluate_all(fresh)
+                continue
+            if verdict is not None:
+                break
+
+            schedules, scores = self._genetic.next_generation(
+                schedules, scores, self._evaluate_all
+            )
+
+        if self._checkpoints is not None:
+            self._checkpoints.submit(
+                Checkpoint.of_schedules(
+                    problem, generation, schedules, scores, self._random.getstate()
+                )
+            )
+        return schedules[0]
+
+    def _solve_islands(self, problem: ProblemSnapshot, report: Messenger) -> Schedule:
+        with IslandModel(
+            problem,
+            self._islands,
+            self._population_size,
+            self._mutation_rate,
+            self._initialization,
+            self._local_search_budget,
+        ) as islands:
+            generation = 0
+            while True:
+                epoch = min(
+                    self._migration_interval, self._generation_limit - generation
+                )
+                islands.evolve(epoch, self._random.getrandbits(32))
+                generation += epoch
+
+                best_schedule, best_scores = islands.best()
+                conflicts = count_conflicts(best_schedule)
+                report(
+                    f"Generation {generation}: Best fitness {conflicts.score} ({conflicts}), "
+                    f"islands {best_scores}"
+                )
+                self._keep_best(best_schedule, conflicts.score)
+
+                if conflicts.score == 0 or generation >= self._generation_limit:
+                    return best_schedule
+                if self._budget_verdict(conflicts.score, report, can_restart=False):
+                    return best_schedule
+
+                islands.migrate()
+
+    def _solve_vectorized(self, problem: ProblemSnapshot, report: Messenger) -> Schedule:
+        encoding = GenomeEncoding(problem)
+        rng = np.random.default_rng(self._random.getrandbits(64))
+        initial_genomes = None
+        first_generation = 0
+        checkpoint = self._load_checkpoint(problem, LAYOUT_GENOMES, report)
+        if checkpoint is not None:
+            initial_genomes = np.frombuffer(checkpoint.genomes, dtype=np.int32).reshape(
+                (self._population_size, len(problem), GENE_WIDTH)
+            )
+            rng.bit_generator.state = checkpoint.restore_rng_state()
+            first_generation = checkpoint.generation
+        elif self._initialization != INITIALIZATION_RANDOM:
+            initial_genomes = np.stack(
+                [
+                    encoding.encode(self._genetic.create_new_schedule())
+                    for _ in range(self._population_size)
+                ]
+            )
+
+        if self._processes <= 1:
+            return self._run_vectorized(
+                encoding,
+                self._create_population(
+                    encoding,
+                    self._population_size,
+                    rng,
+                    initial_genomes=initial_genomes,
+                ),
+                rng,
+                first_generation,
+                report,
+            )
+
+        # Популяция лежит в разделяемой памяти, процессы оценивают её срезы на месте
+        buffer = SharedPopulationBuffer(self._population_size, len(problem))
+        evaluator = SharedMemoryEvaluator(encoding, buffer, self._processes)
+        population = None
+        try:
+            population = self._create_population(
+                encoding,
+                self._population_size,
+                rng,
+                genomes=buffer.genomes,
+                scores=buffer.scores,
+                evaluator=evaluator,
+                initial_genomes=initial_genomes,
+            )
+            return self._run_vectorized(
+                encoding, population, rng, first_generation, report
+            )
+        finally:
+            evaluator.shutdown()
+            # Представления разделяемой памяти нужно отпустить до её закрытия
+            population = None
+            buffer.close()
+
+    def _run_vectorized(
+        self,
+        encoding: GenomeEncoding,
+        population: VectorizedPopulation,
+        rng: np.random.Generator,
+        first_generation: int,
+        report: Messenger,
+    ) -> Schedule:
+        generation = first_generation
+        for generation in range(first_generation, self._generation_limit):
+            population.sort()
+            if self._should_checkpoint(generation):
+                self._checkpoints.submit(
+                    Checkpoint.of_genomes(
+                        encoding.problem,
+                        generation,
+                        population.genomes,
+                        population.scores,
+                        rng.bit_generator.state,
+                    )
+                )
+
+            teachers, rooms, groups = count_population_conflicts(
+                encoding, population.genomes[:1]
+            )
+            conflicts = ConflictReport(int(teachers[0]), int(rooms[0]), int(groups[0]))
+            report(
+                f"Generation {generation + 1}: Best fitness {conflicts.score} ({conflicts})"
+            )
+            if self._improves(conflicts.score):
+                self._keep_best(encoding.decode(population.genomes[0]), conflicts.score)
+
+            if conflicts.score == 0 or generation == self._generation_limit - 1:
+                break
+
+            verdict = self._budget_verdict(conflicts.score, report)
+            if verdict == STAGNATION_RESTART:
+                population.restart(1)
+                continue
+            if verdict is not None:
+                break
+
+            population.next_generation(self._mutation_rate)
+
+        if self._checkpoints is not None:
+            self._checkpoints.submit(
+                Checkpoint.of_genomes(
+                    encoding.problem,
+                    generation,
+                    population.genomes,
+                    population.scores,
+                    rng.bit_generator.state,
+                )
+            )
+        return encoding.decode(population.genomes[0])
@@ -0,0 +1,91 @@
+import random
+from typing import Dict, Optional, Tuple
+
+from ..budget import STAGNATION_RESTART, SearchBudget
+from ..construction import INITIALIZATION_RANDOM
+from ..genetic import Schedule
+from ..problem import ProblemSnapshot
+from .base import Messenger
+from .trajectory import TrajectoryEngine
+
+DEFAULT_TENURE = 20
+DEFAULT_CANDIDATES = 30
+
+
+class TabuEngine(TrajectoryEngine):
+    """
+    Tabu search over single-gene moves. Every iteration samples candidate moves and
+    performs the best one even if it makes the schedule worse. Putting a lesson back
+    into a (day, time) it has just left is forbidden for a number of iterations
+    (the tenure), unless the move gives a new best schedule (aspiration). A restart
+    starts from a new schedule with an empty tabu list.
+    """
+
+    def __init__(
+        self,
+        iterations: int,
+        report_interval: int = 100,
+        initialization: str = INITIALIZATION_RANDOM,
+        rng: Optional[random.Random] = None,
+        budget: Optional[SearchBudget] = None,
+        tenure: int = DEFAULT_TENURE,
+        candidates: int = DEFAULT_CANDIDATES,
+    ):
+        super().__init__(iterations, report_interval, initialization, rng, budget)
+        self._tenure = tenure
+        self._candidates = max(candidates, 1)
+
+    def solve(self, problem: ProblemSnapshot, report: Messenger) -> Schedule:
+        evaluator = self._start(problem)
+        best_schedule = list(evaluator.schedule)
+        best_score = evaluator.score
+        self._keep_best(best_schedule, best_score)
+        if not best_schedule:
+            return best_schedule
+
+        tabu: Dict[Tuple[int, int, int], int] = {}
+
+        for iteration in range(1, self._iterations + 1):
+            if best_score == 0:
+                break
+
+            score = evaluator.score
+            chosen = None
+            chosen_delta = None
+            for _ in range(self._candidates):
+                index = self._pick_lesson(evaluator)
+                gene = self._genetic.random_gene(index)
+                delta = evaluator.delta(index, gene)
+
+                forbidden = tabu.get((index, gene.day_id, gene.time_id), 0) > iteration
+                if forbidden and score + delta <= best_score:
+                    continue
+                if chosen_delta is None or delta > chosen_delta:
+                    chosen, chosen_delta = (index, gene), delta
+
+            if chosen is not None:
+                index, gene = chosen
+                move = evaluator.apply_move(index, gene)
+                tabu[(index, move.previous.day_id, move.previous.time_id)] = (
+                    iteration + self._tenure
+                )
+                if evaluator.score > best_score:
+                    best_score = evaluator.score
+                    best_schedule = list(evaluator.schedule)
+                    self._keep_best(best_schedule, best_score)
+
+            if iteration % self._report_interval == 0:
+                report(
+                    f"Iteration {iteration}: Best fitness {best_score}, "
+                    f"current {evaluator.score}, tabu {len(tabu)}"
+                )
+                tabu = {key: until for key, until in tabu.items() if until > iteration}
+
+                verdict = self._budget_verdict(best_score, report)
+                if verdict == STAGNATION_RESTART:
+                    evaluator = self._restart()
+                    tabu = {}
+                elif verdict is not None:
+                    break
+
+        return best_schedule
@@ -0,0 +1,60 @@
+import random
+from typing import Optional
+
+from ..budget import UNLIMITED, SearchBudget
+from ..construction import INITIALIZATION_RANDOM
+from ..genetic import GeneticAlgorithm
+from ..incremental import IncrementalEvaluator
+from ..problem import ProblemSnapshot
+from .base import SolverEngine
+
+CONFLICT_PICK_ATTEMPTS = 8
+
+
+class TrajectoryEngine(SolverEngine):
+    """
+    Common ground of single-trajectory engines: one schedule is built with the chosen
+    initialization strategy and then changed gene by gene through an incremental
+    evaluator. Zero iterations means no iteration limit; the budget is checked at
+    every report, so stagnation is counted in report intervals.
+    """
+
+    _iterations: int
+    _report_interval: int
+    _initialization: str
+    _random: random.Random
+    _genetic: GeneticAlgorithm
+
+    def __init__(
+        self,
+        iterations: int,
+        report_interval: int = 100,
+        initialization: str = INITIALIZATION_RANDOM,
+        rng: Optional[random.Random] = None,
+        budget: Optional[SearchBudget] = None,
+    ):
+        super().__init__(budget)
+        self._iterations = iterations if iterations > 0 else UNLIMITED
+        self._report_interval = max(report_interval, 1)
+        self._initialization = initialization
+        self._random = rng if rng is not None else random.Random()
+
+    def _start(self, problem: ProblemSnapshot) -> IncrementalEvaluator:
+        self.budget.start()
+        self._genetic = GeneticAlgorithm(
+            problem, 0.0, self._random, initialization=self._initialization
+        )
+        return self._restart()
+
+    def _restart(self) -> IncrementalEvaluator:
+        return IncrementalEvaluator(self._genetic.create_new_schedule())
+
+    def _pick_lesson(self, evaluator: IncrementalEvaluator) -> int:
+        """A random lesson, preferring the ones that are currently in conflict."""
+        size = len(evaluator.schedule)
+        index = self._random.randrange(size)
+        for _ in range(CONFLICT_PICK_ATTEMPTS):
+            if evaluator.conflicts_of(index) > 0:
+                break
+            index = self._random.randrange(size)
+        return index
@@ -0,0 +1,78 @@
+from typing import Iterable, Sequence, Set, Tuple
+
+Placement = Tuple[int, int, int, int, Sequence[int]]
+
+
+class ConflictReport:
+    """
+    Number of clashes in a schedule, broken down by constraint. Every lesson that
+    lands on an already occupied (resource, day, time) slot counts as one clash.
+    """
+
+    teacher_conflicts: int
+    room_conflicts: int
+    group_conflicts: int
+
+    @property
+    def total(self) -> int:
+        return self.teacher_conflicts + self.room_conflicts + self.group_conflicts
+
+    @property
+    def score(self) -> int:
+        return -self.total
+
+    def __init__(self, teacher_conflicts: int, room_conflicts: int, group_conflicts: int):
+        self.teacher_conflicts = teacher_conflicts
+        self.room_conflicts = room_conflicts
+        self.group_conflicts = group_conflicts
+
+    def __str__(self):
+        return (
+            f"teachers {self.teacher_conflicts}, "
+            f"rooms {self.room_conflicts}, "
+            f"groups {self.group_conflicts}"
+        )
+
+
+def count_conflicts(schedule: Iterable) -> ConflictReport:
+    """
+    Counts clashes of a schedule of LessonPrecursor-like objects in linear time
+    using hashed occupancy sets keyed by (resource, day, time).
+    """
+    return count_placement_conflicts(
+        (lesson.day_id, lesson.time_id, lesson.teacher_id, lesson.room_id, lesson.group_ids)
+        for lesson in schedule
+    )
+
+
+def count_placement_conflicts(placements: Iterable[Placement]) -> ConflictReport:
+    """Same as count_conflicts, but for plain (day, time, teacher, room, group ids) tuples."""
+    teacher_for_time: Set[Tuple[int, int, int]] = set()
+    room_for_time: Set[Tuple[int, int, int]] = set()
+    group_for_time: Set[Tuple[int, int, int]] = set()
+
+    teacher_conflicts = 0
+    room_conflicts = 0
+    group_conflicts = 0
+
+    for day_id, time_id, teacher_id, room_id, group_ids in placements:
+        key = (teacher_id, day_id, time_id)
+        if key in teacher_for_time:
+            teacher_conflicts += 1
+        else:
+            teacher_for_time.add(key)
+
+        key = (room_id, day_id, time_id)
+        if key in room_for_time:
+            room_conflicts += 1
+        else:
+            room_for_time.add(key)
+
+        for group_id in group_ids:
+            key = (group_id, day_id, time_id)
+            if key in group_for_time:
+                group_conflicts += 1
+            else:
+                group_for_time.add(key)
+
+    return ConflictReport(teacher_conflicts, room_conflicts, group_conflicts)
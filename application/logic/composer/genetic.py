@@ -0,0 +1,130 @@
+import random
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+from .coloring import DsaturConstructor
+from .construction import (
+    INITIALIZATION_COLORING,
+    INITIALIZATION_GREEDY,
+    INITIALIZATION_RANDOM,
+    GreedyConstructor,
+)
+from .fitness import count_conflicts
+from .incremental import IncrementalEvaluator
+from .local_search import MinConflictsSearch
+from .problem import LessonPrecursor, LessonRequirement, ProblemSnapshot
+
+Schedule = List[LessonPrecursor]
+
+
+def sort_population(
+    schedules: Sequence[Schedule], scores: Sequence[int]
+) -> Tuple[List[Schedule], List[int]]:
+    """Orders a population from the best to the worst score."""
+    order = sorted(range(len(schedules)), key=scores.__getitem__, reverse=True)
+    return [schedules[i] for i in order], [scores[i] for i in order]
+
+
+class GeneticAlgorithm:
+    """
+    Operators of the composer GA over a problem snapshot. Does not touch the database,
+    so it can run in worker processes as well as inside ComposerTask. With a local
+    search budget every child is also repaired by min-conflicts (memetic step).
+    Random genes are drawn from the placement domains of the lessons: an available
+    slot first, then a teacher and a room available at it.
+    """
+
+    _problem: ProblemSnapshot
+    _mutation_rate: float
+    _random: random.Random
+    _constructor: Optional[Union[GreedyConstructor, DsaturConstructor]]
+    local_search: Optional[MinConflictsSearch]
+
+    def __init__(
+        self,
+        problem: ProblemSnapshot,
+        mutation_rate: float,
+        rng: Optional[random.Random] = None,
+        initialization: str = INITIALIZATION_RANDOM,
+        local_search_budget: int = 0,
+    ):
+        self._problem = problem
+        self._mutation_rate = mutation_rate
+        self._random = rng if rng is not None else random.Random()
+        self._constructor = None
+        if initialization == INITIALIZATION_GREEDY:
+            self._constructor = GreedyConstructor(problem, self._random)
+        elif initialization == INITIALIZATION_COLORING:
+            self._constructor = DsaturConstructor(problem, self._random)
+        self.local_search = (
+            MinConflictsSearch(problem, local_search_budget, self._random)
+            if local_search_budget > 0
+            else None
+        )
+
+    def create_new_schedule(self) -> Schedule:
+        if self._constructor is not None:
+            return self._constructor.create_schedule()
+
+        return [self._sample(lesson) for lesson in self._problem.lessons]
+
+    def _sample(self, lesson: LessonRequirement) -> LessonPrecursor:
+        choice = self._random.choice
+        day_id, time_id = choice(lesson.slots)
+        return LessonPrecursor(
+            group_ids=lesson.group_ids,
+            subject_partition_id=lesson.subject_partition_id,
+            day_id=day_id,
+            time_id=time_id,
+            teacher_id=choice(lesson.teachers_at(day_id, time_id)),
+            room_id=choice(lesson.rooms_at(day_id, time_id)),
+        )
+
+    def random_gene(self, index: int) -> LessonPrecursor:
+        return self._sample(self._problem.lessons[index])
+
+    def mutate(self, schedule: Schedule, evaluator: Optional[IncrementalEvaluator] = None):
+        index = self._random.randint(0, len(schedule) - 1)
+
+        # Гены разделяются между родителями и потомками, поэтому заменяем, а не меняем на месте
+        if evaluator is None:
+            schedule[index] = self.random_gene(index)
+        else:
+            evaluator.apply_move(index, self.random_gene(index))
+
+    @staticmethod
+    def check(schedule: Schedule) -> int:
+        return count_conflicts(schedule).score
+
+    def crossover(self, first: Schedule, second: Schedule) -> Schedule:
+        rand = self._random.random
+        return [a if rand() > 0.5 else b for a, b in zip(first, second)]
+
+    def breed(self, parents: Sequence[Schedule], count: int) -> List[Schedule]:
+        children = []
+        for _ in range(count):
+            parent1, parent2 = self._random.sample(parents, 2)
+            child = self.crossover(parent1, parent2)
+            if self._random.random() < self._mutation_rate:
+                self.mutate(child)
+            if self.local_search is not None:
+                self.local_search.improve(child)
+            children.append(child)
+        return children
+
+    def next_generation(
+        self,
+        schedules: Sequence[Schedule],
+        scores: Sequence[int],
+        evaluate: Callable[[List[Schedule]], List[int]],
+    ) -> Tuple[List[Schedule], List[int]]:
+        """
+        Keeps the better half of a sorted population and fills the rest with
+        children of it; only the children are passed to evaluate.
+        """
+        # Селекция: берем 50% лучших особей
+        elite_count = len(schedules) // 2
+        elite = list(schedules[:elite_count])
+
+        # Скрещивание: создаем новое поколение на основе лучших
+        children = self.breed(elite, len(schedules) - elite_count)
+        return elite + children, list(scores[:elite_count]) + evaluate(children)
@@ -0,0 +1,135 @@
+from typing import Dict, List, Tuple
+
+from .fitness import ConflictReport
+from .problem import LessonPrecursor
+
+SlotKey = Tuple[int, int, int]
+
+
+class Move:
+    """A performed gene replacement, kept so that it can be undone."""
+
+    index: int
+    previous: LessonPrecursor
+
+    def __init__(self, index: int, previous: LessonPrecursor):
+        self.index = index
+        self.previous = previous
+
+
+class IncrementalEvaluator:
+    """
+    Keeps occupancy tables of a single schedule and updates its conflict score
+    in O(1) (per group of the lesson) whenever one gene is replaced. The schedule
+    passed in is owned by the evaluator and is changed in place by apply_move.
+    Counting rules are the same as in fitness.count_conflicts.
+    """
+
+    _schedule: List[LessonPrecursor]
+    _teachers: Dict[SlotKey, int]
+    _rooms: Dict[SlotKey, int]
+    _groups: Dict[SlotKey, int]
+
+    def __init__(self, schedule: List[LessonPrecursor]):
+        self._schedule = schedule
+        self._teachers = {}
+        self._rooms = {}
+        self._groups = {}
+        self._teacher_conflicts = 0
+        self._room_conflicts = 0
+        self._group_conflicts = 0
+
+        for lesson in schedule:
+            self._place(lesson)
+
+    @property
+    def schedule(self) -> List[LessonPrecursor]:
+        return self._schedule
+
+    @property
+    def score(self) -> int:
+        return -(self._teacher_conflicts + self._room_conflicts + self._group_conflicts)
+
+    @property
+    def report(self) -> ConflictReport:
+        return ConflictReport(
+            self._teacher_conflicts, self._room_conflicts, self._group_conflicts
+        )
+
+    @staticmethod
+    def _increment(table: Dict[SlotKey, int], key: SlotKey) -> int:
+        count = table.get(key, 0)
+        table[key] = count + 1
+        return 1 if count else 0
+
+    @staticmethod
+    def _decrement(table: Dict[SlotKey, int], key: SlotKey) -> int:
+        count = table[key] - 1
+        if count:
+            table[key] = count
+            return 1
+        del table[key]
+        return 0
+
+    def _place(self, lesson: LessonPrecursor):
+        day_id, time_id = lesson.day_id, lesson.time_id
+        self._teacher_conflicts += self._increment(
+            self._teachers, (lesson.teacher_id, day_id, time_id)
+        )
+        self._room_conflicts += self._increment(
+            self._rooms, (lesson.room_id, day_id, time_id)
+        )
+        for group_id in lesson.group_ids:
+            self._group_conflicts += self._increment(
+                self._groups, (group_id, day_id, time_id)
+            )
+
+    def _remove(self, lesson: LessonPrecursor):
+        day_id, time_id = lesson.day_id, lesson.time_id
+        self._teacher_conflicts -= self._decrement(
+            self._teachers, (lesson.teacher_id, day_id, time_id)
+        )
+        self._room_conflicts -= self._decrement(
+            self._rooms, (lesson.room_id, day_id, time_id)
+        )
+        for group_id in lesson.group_ids:
+            self._group_conflicts -= self._decrement(
+                self._groups, (group_id, day_id, time_id)
+            )
+
+    def teacher_load(self, teacher_id: int, day_id: int, time_id: int) -> int:
+        return self._teachers.get((teacher_id, day_id, time_id), 0)
+
+    def room_load(self, room_id: int, day_id: int, time_id: int) -> int:
+        return self._rooms.get((room_id, day_id, time_id), 0)
+
+    def group_load(self, group_id: int, day_id: int, time_id: int) -> int:
+        return self._groups.get((group_id, day_id, time_id), 0)
+
+    def conflicts_of(self, index: int) -> int:
+        """Number of other lessons sharing a teacher, room or group slot with the given one."""
+        lesson = self._schedule[index]
+        day_id, time_id = lesson.day_id, lesson.time_id
+        conflicts = self._teachers[(lesson.teacher_id, day_id, time_id)] - 1
+        conflicts += self._rooms[(lesson.room_id, day_id, time_id)] - 1
+        for group_id in lesson.group_ids:
+            conflicts += self._groups[(group_id, day_id, time_id)] - 1
+        return conflicts
+
+    def apply_move(self, index: int, lesson: LessonPrecursor) -> Move:
+        previous = self._schedule[index]
+        self._remove(previous)
+        self._place(lesson)
+        self._schedule[index] = lesson
+        return Move(index, previous)
+
+    def undo_move(self, move: Move):
+        self.apply_move(move.index, move.previous)
+
+    def delta(self, index: int, lesson: LessonPrecursor) -> int:
+        """Score change that replacing the gene would cause, without keeping the move."""
+        score = self.score
+        move = self.apply_move(index, lesson)
+        delta = self.score - score
+        self.undo_move(move)
+        return delta
@@ -0,0 +1,145 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from .cache import FitnessCache
+from .construction import INITIALIZATION_RANDOM
+from .genetic import GeneticAlgorithm, Schedule, sort_population
+from .parallel import decode_schedule, encode_schedule
+from .problem import ProblemSnapshot
+
+DEFAULT_MIGRANTS = 2
+
+_problem: Optional[ProblemSnapshot] = None
+_mutation_rate: float = 0.0
+_initialization: str = INITIALIZATION_RANDOM
+_local_search_budget: int = 0
+
+
+def _initialize_island_worker(
+    problem: ProblemSnapshot,
+    mutation_rate: float,
+    initialization: str,
+    local_search_budget: int,
+):
+    global _problem, _mutation_rate, _initialization, _local_search_budget
+    _problem = problem
+    _mutation_rate = mutation_rate
+    _initialization = initialization
+    _local_search_budget = local_search_budget
+
+
+def _evolve_island(
+    population: Optional[List[bytes]],
+    population_size: int,
+    generations: int,
+    seed: int,
+) -> Tuple[List[bytes], List[int]]:
+    genetic = GeneticAlgorithm(
+        _problem,
+        _mutation_rate,
+        random.Random(seed),
+        _initialization,
+        _local_search_budget,
+    )
+    if population is None:
+        schedules = [genetic.create_new_schedule() for _ in range(population_size)]
+    else:
+        schedules = [decode_schedule(_problem, encoded) for encoded in population]
+
+    cache = FitnessCache()
+
+    def evaluate(batch: List[Schedule]) -> List[int]:
+        return [cache.get_or_evaluate(schedule, genetic.check) for schedule in batch]
+
+    scores = evaluate(schedules)
+    for _ in range(generations):
+        schedules, scores = sort_population(schedules, scores)
+        if scores[0] == 0:
+            break
+        schedules, scores = genetic.next_generation(schedules, scores, evaluate)
+
+    schedules, scores = sort_population(schedules, scores)
+    return [encode_schedule(schedule) for schedule in schedules], scores
+
+
+class IslandModel:
+    """
+    Several GA subpopulations, each evolving in its own worker process. Between
+    epochs the best individuals of every island migrate to the next one (ring
+    topology), replacing its worst individuals.
+    """
+
+    _problem: ProblemSnapshot
+    _executor: ProcessPoolExecutor
+    _populations: List[Optional[List[bytes]]]
+    _scores: List[List[int]]
+
+    def __init__(
+        self,
+        problem: ProblemSnapshot,
+        islands: int,
+        population_size: int,
+        mutation_rate: float,
+        initialization: str = INITIALIZATION_RANDOM,
+        local_search_budget: int = 0,
+        migrants: int = DEFAULT_MIGRANTS,
+    ):
+        self._problem = problem
+        self._population_size = population_size
+        self._migrants = min(migrants, population_size // 2)
+        self._populations = [None] * islands
+        self._scores = [[] for _ in range(islands)]
+        self._executor = ProcessPoolExecutor(
+            max_workers=islands,
+            initializer=_initialize_island_worker,
+            initargs=(problem, mutation_rate, initialization, local_search_budget),
+        )
+
+    def evolve(self, generations: int, seed: int):
+        """Runs one epoch of the given number of generations on every island at once."""
+        rng = random.Random(seed)
+        futures = [
+            self._executor.submit(
+                _evolve_island,
+                population,
+                self._population_size,
+                generations,
+                rng.getrandbits(32),
+            )
+            for population in self._populations
+        ]
+        results = [future.result() for future in futures]
+        self._populations = [population for population, _ in results]
+        self._scores = [scores for _, scores in results]
+
+    def migrate(self):
+        if self._migrants <= 0 or len(self._populations) < 2:
+            return
+
+        emigrants = [
+            (population[: self._migrants], scores[: self._migrants])
+            for population, scores in zip(self._populations, self._scores)
+        ]
+        for i, (migrants, migrant_scores) in enumerate(emigrants):
+            target = (i + 1) % len(self._populations)
+            self._populations[target][-self._migrants :] = migrants
+            self._scores[target][-self._migrants :] = migrant_scores
+
+    def best(self) -> Tuple[Schedule, List[int]]:
+        """The best schedule over all islands and the best score of every island."""
+        best_scores = [scores[0] for scores in self._scores]
+        island = max(range(len(best_scores)), key=best_scores.__getitem__)
+        return (
+            decode_schedule(self._problem, self._populations[island][0]),
+            best_scores,
+        )
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "IslandModel":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
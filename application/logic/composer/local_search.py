@@ -0,0 +1,93 @@
+import random
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .incremental import IncrementalEvaluator
+from .problem import LessonPrecursor, ProblemSnapshot
+
+
+class MinConflictsSearch:
+    """
+    Bounded min-conflicts hill climbing. Repeatedly picks a lesson that is in
+    conflict and moves it to the available (day, time) where it clashes least, taking
+    the least busy teacher and room available there. A move is kept only if it lowers the number
+    of conflicts. The budget is the number of lessons tried per schedule.
+    """
+
+    _problem: ProblemSnapshot
+    _budget: int
+    _random: random.Random
+    repaired: int
+
+    def __init__(
+        self,
+        problem: ProblemSnapshot,
+        budget: int,
+        rng: Optional[random.Random] = None,
+    ):
+        self._problem = problem
+        self._budget = budget
+        self._random = rng if rng is not None else random.Random()
+        self.repaired = 0
+
+    def take_repaired(self) -> int:
+        """Conflicts repaired since the previous call."""
+        repaired, self.repaired = self.repaired, 0
+        return repaired
+
+    @staticmethod
+    def _least_loaded(
+        ids: Sequence[int], load: Callable[[int, int, int], int], day_id: int, time_id: int
+    ) -> int:
+        return min(ids, key=lambda id_: load(id_, day_id, time_id))
+
+    def _best_move(
+        self, evaluator: IncrementalEvaluator, index: int
+    ) -> Tuple[int, Optional[LessonPrecursor]]:
+        lesson = self._problem.lessons[index]
+        best_delta, best_gene = 0, None
+        for day_id, time_id in self._random.sample(lesson.slots, len(lesson.slots)):
+            gene = LessonPrecursor(
+                group_ids=lesson.group_ids,
+                subject_partition_id=lesson.subject_partition_id,
+                day_id=day_id,
+                time_id=time_id,
+                teacher_id=self._least_loaded(
+                    lesson.teachers_at(day_id, time_id),
+                    evaluator.teacher_load,
+                    day_id,
+                    time_id,
+                ),
+                room_id=self._least_loaded(
+                    lesson.rooms_at(day_id, time_id), evaluator.room_load, day_id, time_id
+                ),
+            )
+            delta = evaluator.delta(index, gene)
+            if delta > best_delta:
+                best_delta, best_gene = delta, gene
+        return best_delta, best_gene
+
+    def improve(self, schedule: List[LessonPrecursor]) -> int:
+        """Improves the schedule in place and returns its new score."""
+        evaluator = IncrementalEvaluator(schedule)
+        conflicting: List[int] = []
+        for _ in range(self._budget):
+            if evaluator.score == 0:
+                break
+
+            # Список конфликтных занятий обновляется, только когда исчерпан
+            if not conflicting:
+                conflicting = [
+                    i for i in range(len(schedule)) if evaluator.conflicts_of(i) > 0
+                ]
+                self._random.shuffle(conflicting)
+
+            index = conflicting.pop()
+            if evaluator.conflicts_of(index) == 0:
+                continue
+
+            delta, gene = self._best_move(evaluator, index)
+            if gene is not None:
+                evaluator.apply_move(index, gene)
+                self.repaired += delta
+
+        return evaluator.score
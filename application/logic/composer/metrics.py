@@ -0,0 +1,108 @@
+import functools
+import time
+from typing import Any, Dict, Optional
+
+PHASE_LOAD = "load"
+PHASE_INIT = "init"
+PHASE_FITNESS = "fitness"
+PHASE_SELECTION = "selection"
+PHASE_CROSSOVER = "crossover"
+PHASE_MUTATION = "mutation"
+PHASE_LOCAL_SEARCH = "local search"
+PHASE_SAVE = "save"
+PHASES = (
+    PHASE_LOAD,
+    PHASE_INIT,
+    PHASE_FITNESS,
+    PHASE_SELECTION,
+    PHASE_CROSSOVER,
+    PHASE_MUTATION,
+    PHASE_LOCAL_SEARCH,
+    PHASE_SAVE,
+)
+
+
+class PhaseMetrics:
+    """
+    Monotonic-clock time and call counts per composer phase. Methods are measured by
+    replacing them on the instance with timed wrappers (instrument), so a run
+    without metrics executes no measuring code at all. Every sorting of the
+    population counts as a generation.
+    """
+
+    seconds: Dict[str, float]
+    calls: Dict[str, int]
+
+    def __init__(self):
+        self.seconds = {}
+        self.calls = {}
+
+    def add(self, phase: str, seconds: float, calls: int = 1):
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + calls
+
+    def merge(self, other: "PhaseMetrics"):
+        """Adds the times and calls of other, e.g. of a subproblem solved elsewhere."""
+        for phase, seconds in other.seconds.items():
+            self.add(phase, seconds, other.calls[phase])
+
+    def instrument(self, obj: Any, method: str, phase: str):
+        """Replaces obj.method with a wrapper adding its run time to phase."""
+        function = getattr(obj, method)
+        clock = time.perf_counter
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.add(phase, clock() - start)
+
+        setattr(obj, method, timed)
+
+    @property
+    def generations(self) -> int:
+        return self.calls.get(PHASE_SELECTION, 0)
+
+    def per_generation(self) -> Dict[str, float]:
+        """Mean milliseconds per generation of the phases that run every generation."""
+        generations = max(self.generations, 1)
+        return {
+            phase: self.seconds[phase] * 1000 / generations
+            for phase in (
+                PHASE_FITNESS,
+                PHASE_SELECTION,
+                PHASE_CROSSOVER,
+                PHASE_MUTATION,
+                PHASE_LOCAL_SEARCH,
+            )
+            if phase in self.seconds
+        }
+
+    def as_dict(self) -> Dict[str, Dict[str, Optional[float]]]:
+        per_generation = self.per_generation()
+        return {
+            phase: {
+                "ms": self.seconds[phase] * 1000,
+                "calls": self.calls[phase],
+                "ms_per_generation": per_generation.get(phase),
+            }
+            for phase in PHASES
+            if phase in self.seconds
+        }
+
+    def __str__(self):
+        phases = ", ".join(
+            f"{phase} {self.seconds[phase] * 1000:.1f} ms/{self.calls[phase]}"
+            for phase in PHASES
+            if phase in self.seconds
+        )
+        generation = ", ".join(
+            f"{phase} {milliseconds:.2f}"
+            for phase, milliseconds in self.per_generation().items()
+        )
+        return (
+            f"Phases (total ms/calls): {phases}; "
+            f"per generation over {self.generations} (ms): {generation}"
+        )
@@ -0,0 +1,95 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Sequence, Tuple
+
+from .fitness import count_placement_conflicts
+from .problem import LessonPrecursor, ProblemSnapshot
+
+_lesson_groups: Tuple[Tuple[int, ...], ...] = ()
+
+
+def encode_schedule(schedule: Sequence[LessonPrecursor]) -> bytes:
+    """Packs a schedule into day, time, teacher, room ids, four integers per gene."""
+    return array(
+        "i",
+        [
+            value
+            for lesson in schedule
+            for value in (lesson.day_id, lesson.time_id, lesson.teacher_id, lesson.room_id)
+        ],
+    ).tobytes()
+
+
+def decode_schedule(problem: ProblemSnapshot, encoded: bytes) -> List[LessonPrecursor]:
+    genes = array("i")
+    genes.frombytes(encoded)
+    return [
+        LessonPrecursor(
+            group_ids=lesson.group_ids,
+            subject_partition_id=lesson.subject_partition_id,
+            day_id=genes[i],
+            time_id=genes[i + 1],
+            teacher_id=genes[i + 2],
+            room_id=genes[i + 3],
+        )
+        for lesson, i in zip(problem.lessons, range(0, len(genes), 4))
+    ]
+
+
+def _initialize_worker(lesson_groups: Tuple[Tuple[int, ...], ...]):
+    global _lesson_groups
+    _lesson_groups = lesson_groups
+
+
+def _score_chunk(chunk: List[bytes]) -> List[int]:
+    scores = []
+    for encoded in chunk:
+        genes = array("i")
+        genes.frombytes(encoded)
+        scores.append(
+            count_placement_conflicts(
+                (genes[i], genes[i + 1], genes[i + 2], genes[i + 3], group_ids)
+                for i, group_ids in zip(range(0, len(genes), 4), _lesson_groups)
+            ).score
+        )
+    return scores
+
+
+class ParallelEvaluator:
+    """
+    Scores schedules in a pool of worker processes. Only the group ids of every
+    lesson are shipped to the workers (once, on start); schedules travel as packed
+    integer arrays. Workers are reused until shutdown is called.
+    """
+
+    _executor: ProcessPoolExecutor
+    _processes: int
+
+    def __init__(self, problem: ProblemSnapshot, processes: int):
+        self._processes = processes
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_initialize_worker,
+            initargs=(tuple(lesson.group_ids for lesson in problem.lessons),),
+        )
+
+    def evaluate(self, schedules: Sequence[Sequence[LessonPrecursor]]) -> List[int]:
+        encoded = [encode_schedule(schedule) for schedule in schedules]
+        chunk_size = max(1, -(-len(encoded) // self._processes))
+        chunks = [
+            encoded[i : i + chunk_size] for i in range(0, len(encoded), chunk_size)
+        ]
+
+        scores = []
+        for chunk_scores in self._executor.map(_score_chunk, chunks):
+            scores.extend(chunk_scores)
+        return scores
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "ParallelEvaluator":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
@@ -0,0 +1,144 @@
+import time
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.orm import Session
+
+from ...data import Lesson
+from .problem import LessonPrecursor
+
+LessonKey = Tuple[int, int, int, int]
+
+
+class SaveReport:
+    """
+    Result of writing a schedule: the number of lesson rows, how many of them were
+    inserted, updated and deleted, and the time taken.
+    """
+
+    rows: int
+    inserted: int
+    updated: int
+    deleted: int
+    seconds: float
+
+    def __init__(
+        self, rows: int, inserted: int, updated: int, deleted: int, seconds: float
+    ):
+        self.rows = rows
+        self.inserted = inserted
+        self.updated = updated
+        self.deleted = deleted
+        self.seconds = seconds
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.updated + self.deleted
+
+    def __str__(self):
+        return (
+            f"{self.rows} lessons, {self.changed} changed ({self.inserted} inserted, "
+            f"{self.updated} updated, {self.deleted} deleted) in {self.seconds:.3f} s"
+        )
+
+
+def lesson_rows(schedule: Iterable[LessonPrecursor]) -> List[Dict[str, int]]:
+    """One lessons table row per group of every scheduled lesson."""
+    return [
+        {
+            "group_id": group_id,
+            "subject_partition_id": lesson.subject_partition_id,
+            "day_id": lesson.day_id,
+            "time_id": lesson.time_id,
+            "teacher_id": lesson.teacher_id,
+            "room_id": lesson.room_id,
+        }
+        for lesson in schedule
+        for group_id in lesson.group_ids
+    ]
+
+
+def _key(row) -> LessonKey:
+    return row["group_id"], row["subject_partition_id"], row["day_id"], row["time_id"]
+
+
+def save_schedule(
+    session: Session,
+    schedule: Iterable[LessonPrecursor],
+    group_ids: Optional[Collection[int]] = None,
+) -> SaveReport:
+    """
+    Brings the lessons table in line with the schedule in one transaction. Rows are
+    matched by (group, subject, day, time); matched rows with another teacher or room
+    are updated, unmatched ones deleted or inserted, each kind with one executemany.
+    With group_ids only the lessons of these groups are compared and replaced, the
+    rest of the table is left alone.
+    """
+    start = time.monotonic()
+    rows = lesson_rows(schedule)
+    table = Lesson.__table__
+
+    query = select(table)
+    if group_ids is not None:
+        query = query.where(table.c.group_id.in_(list(group_ids)))
+
+    existing: Dict[LessonKey, List[Tuple[int, int, int]]] = {}
+    for row in session.execute(query).mappings():
+        existing.setdefault(_key(row), []).append(
+            (row["id"], row["teacher_id"], row["room_id"])
+        )
+
+    inserts = []
+    updates = []
+    for row in rows:
+        candidates = existing.get(_key(row))
+        if not candidates:
+            inserts.append(row)
+            continue
+
+        placement = (row["teacher_id"], row["room_id"])
+        # Занятие с тем же ключом и теми же преподавателем и аудиторией не трогаем
+        index = next(
+            (i for i, candidate in enumerate(candidates) if candidate[1:] == placement),
+            len(candidates) - 1,
+        )
+        lesson_id, teacher_id, room_id = candidates.pop(index)
+        if (teacher_id, room_id) != placement:
+            updates.append(
+                {
+                    "lesson_id": lesson_id,
+                    "new_teacher_id": row["teacher_id"],
+                    "new_room_id": row["room_id"],
+                }
+            )
+    deletes = [
+        {"lesson_id": candidate[0]}
+        for candidates in existing.values()
+        for candidate in candidates
+    ]
+
+    try:
+        if deletes:
+            session.execute(
+                delete(table).where(table.c.id == bindparam("lesson_id")), deletes
+            )
+        if updates:
+            session.execute(
+                update(table)
+                .where(table.c.id == bindparam("lesson_id"))
+                .values(
+                    teacher_id=bindparam("new_teacher_id"),
+                    room_id=bindparam("new_room_id"),
+                ),
+                updates,
+            )
+        if inserts:
+            session.execute(table.insert(), inserts)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    return SaveReport(
+        len(rows), len(inserts), len(updates), len(deletes), time.monotonic() - start
+    )
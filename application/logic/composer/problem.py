@@ -0,0 +1,308 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from ...data import (
+    Curriculum,
+    SubjectPartition,
+    ScheduledSubject,
+    Time,
+    Day,
+    Group,
+    Teacher,
+    Room,
+    TermNumber,
+)
+from .domains import DomainIndex, PlacementDomain, Slot
+
+LECTURE_ID = 1
+PRACTICE_ID = 2
+LABORATORY_ID = 3
+
+
+class LessonPrecursor:
+    group_ids: Sequence[int]
+    day_id: int
+    time_id: int
+    subject_partition_id: int
+    teacher_id: int
+    room_id: int
+
+    def __init__(
+        self,
+        group_ids: Sequence[int],
+        day_id: int,
+        time_id: int,
+        subject_partition_id: int,
+        teacher_id: int,
+        room_id: int,
+    ):
+        self.group_ids = group_ids
+        self.day_id = day_id
+        self.time_id = time_id
+        self.subject_partition_id = subject_partition_id
+        self.teacher_id = teacher_id
+        self.room_id = room_id
+
+
+class LessonRequirement:
+    """
+    A single lesson that has to be placed into the timetable, together with
+    the teachers and rooms it is allowed to use and the term it belongs to.
+    The placement domain tells at which (day, time) slots which of them are
+    available; the snapshot gives every lesson without one an unrestricted domain.
+    """
+
+    curriculum_id: int
+    group_ids: Tuple[int, ...]
+    subject_partition_id: int
+    teacher_ids: Tuple[int, ...]
+    room_ids: Tuple[int, ...]
+    term_number_id: int
+    placement: Optional[PlacementDomain]
+
+    def __init__(
+        self,
+        curriculum_id: int,
+        group_ids: Sequence[int],
+        subject_partition_id: int,
+        teacher_ids: Sequence[int],
+        room_ids: Sequence[int],
+        term_number_id: int = 0,
+        placement: Optional[PlacementDomain] = None,
+    ):
+        self.curriculum_id = curriculum_id
+        self.group_ids = tuple(group_ids)
+        self.subject_partition_id = subject_partition_id
+        self.teacher_ids = tuple(teacher_ids)
+        self.room_ids = tuple(room_ids)
+        self.term_number_id = term_number_id
+        self.placement = placement
+
+    @property
+    def slots(self) -> Tuple[Slot, ...]:
+        return self.placement.slots
+
+    def teachers_at(self, day_id: int, time_id: int) -> Tuple[int, ...]:
+        return self.placement.teachers_at(day_id, time_id)
+
+    def rooms_at(self, day_id: int, time_id: int) -> Tuple[int, ...]:
+        return self.placement.rooms_at(day_id, time_id)
+
+
+class ProblemSnapshot:
+    """
+    Everything the composer needs to know about the database, compiled once per run.
+    GA operators read from the snapshot only, so no SQLAlchemy call happens inside
+    the generation loop. Lessons are positional: the i-th gene of every schedule
+    places the i-th requirement.
+
+    A snapshot covers the scheduled subjects of the given terms, all of them placed
+    into the same week, and of the given curricula (all if None); curriculum_ids and
+    group_ids then list the selected curricula and their groups only. Terms of one
+    curriculum share its groups and the lessons table keeps no term, so a curriculum
+    with subjects in several of the selected terms is rejected. Subjects
+    without an allowed teacher or room, or without a time at which one of each is
+    available, are reported with EmptyDomainError while loading.
+    """
+
+    day_ids: Tuple[int, ...]
+    time_ids: Tuple[int, ...]
+    curriculum_ids: Tuple[int, ...]
+    group_ids: Tuple[int, ...]
+    teacher_ids: Tuple[int, ...]
+    room_ids: Tuple[int, ...]
+    lessons: Tuple[LessonRequirement, ...]
+
+    def __init__(
+        self,
+        day_ids: Sequence[int],
+        time_ids: Sequence[int],
+        curriculum_ids: Sequence[int],
+        group_ids: Sequence[int],
+        teacher_ids: Sequence[int],
+        room_ids: Sequence[int],
+        lessons: Sequence[LessonRequirement],
+    ):
+        self.day_ids = tuple(day_ids)
+        self.time_ids = tuple(time_ids)
+        self.curriculum_ids = tuple(curriculum_ids)
+        self.group_ids = tuple(group_ids)
+        self.teacher_ids = tuple(teacher_ids)
+        self.room_ids = tuple(room_ids)
+        self.lessons = tuple(lessons)
+
+        slots = [
+            (day_id, time_id) for day_id in self.day_ids for time_id in self.time_ids
+        ]
+        unrestricted: Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], PlacementDomain] = {}
+        for lesson in self.lessons:
+            if lesson.placement is None:
+                key = (lesson.teacher_ids, lesson.room_ids)
+                if key not in unrestricted:
+                    unrestricted[key] = PlacementDomain(slots, *key)
+                lesson.placement = unrestricted[key]
+
+    def __len__(self):
+        return len(self.lessons)
+
+    @property
+    def term_number_ids(self) -> Tuple[int, ...]:
+        return tuple(sorted({lesson.term_number_id for lesson in self.lessons}))
+
+    @property
+    def scheduled_group_ids(self) -> Tuple[int, ...]:
+        """Groups with at least one lesson to place, i.e. whose week the run composes."""
+        scheduled = {group_id for lesson in self.lessons for group_id in lesson.group_ids}
+        return tuple(group_id for group_id in self.group_ids if group_id in scheduled)
+
+    def subproblem(self, indexes: Sequence[int]) -> "ProblemSnapshot":
+        """
+        The snapshot of the lessons at indexes, in that order. Curricula, groups,
+        teachers and rooms are narrowed to those the lessons can use.
+        """
+        lessons = [self.lessons[i] for i in indexes]
+
+        def used(ids: Tuple[int, ...], lesson_ids) -> List[int]:
+            wanted = {i for lesson in lessons for i in lesson_ids(lesson)}
+            return [i for i in ids if i in wanted]
+
+        return ProblemSnapshot(
+            day_ids=self.day_ids,
+            time_ids=self.time_ids,
+            curriculum_ids=used(self.curriculum_ids, lambda l: (l.curriculum_id,)),
+            group_ids=used(self.group_ids, lambda l: l.group_ids),
+            teacher_ids=used(self.teacher_ids, lambda l: l.teacher_ids),
+            room_ids=used(self.room_ids, lambda l: l.room_ids),
+            lessons=lessons,
+        )
+
+    @classmethod
+    def load(
+        cls,
+        session: Session,
+        term_number_ids: Iterable[int] = (0,),
+        curriculum_ids: Optional[Iterable[int]] = None,
+    ) -> "ProblemSnapshot":
+        term_number_ids = tuple(sorted(set(term_number_ids)))
+        if not term_number_ids:
+            raise ValueError("At least one term is required")
+
+        day_ids = tuple(day.id for day in session.query(Day).order_by(Day.id))
+        time_ids = tuple(time.id for time in session.query(Time).order_by(Time.id))
+        curricula = session.query(Curriculum).order_by(Curriculum.id)
+        if curriculum_ids is not None:
+            curricula = curricula.filter(Curriculum.id.in_(set(curriculum_ids)))
+        curriculum_ids = tuple(curriculum.id for curriculum in curricula)
+        teacher_ids = tuple(
+            teacher.id for teacher in session.query(Teacher).order_by(Teacher.id)
+        )
+        room_ids = tuple(room.id for room in session.query(Room).order_by(Room.id))
+
+        groups_for_curriculum: Dict[int, List[int]] = {
+            curriculum_id: [] for curriculum_id in curriculum_ids
+        }
+        group_ids = []
+        for group in session.query(Group).order_by(Group.id):
+            if group.curriculum_id in groups_for_curriculum:
+                group_ids.append(group.id)
+                groups_for_curriculum[group.curriculum_id].append(group.id)
+
+        lesson_types: Dict[int, int] = dict(
+            session.query(SubjectPartition.id, SubjectPartition.lesson_type_id)
+        )
+        domains = DomainIndex.load(session, day_ids, time_ids)
+
+        subjects_for_term = (
+            session.query(ScheduledSubject)
+            .filter(ScheduledSubject.term_number_id.in_(term_number_ids))
+            .order_by(
+                ScheduledSubject.curriculum_id,
+                ScheduledSubject.term_number_id,
+                ScheduledSubject.id,
+            )
+            .all()
+        )
+
+        lessons = []
+        for subject_for_term in subjects_for_term:
+            subject_for_term: ScheduledSubject = subject_for_term
+            if subject_for_term.curriculum_id not in groups_for_curriculum:
+                continue
+
+            partition_id = subject_for_term.subject_partition_id
+            if partition_id not in lesson_types:
+                continue
+
+            allowed_teachers = domains.teacher_ids(partition_id)
+            allowed_rooms = domains.room_ids(partition_id)
+            curriculum_groups = groups_for_curriculum[subject_for_term.curriculum_id]
+            lesson_type_id = int(lesson_types[partition_id])
+
+            def add_lessons(lesson_group_ids, count):
+                for _ in range(count):
+                    lessons.append(
+                        LessonRequirement(
+                            curriculum_id=subject_for_term.curriculum_id,
+                            group_ids=lesson_group_ids,
+                            subject_partition_id=partition_id,
+                            teacher_ids=allowed_teachers,
+                            room_ids=allowed_rooms,
+                            term_number_id=subject_for_term.term_number_id,
+                            placement=domains.placement(partition_id),
+                        )
+                    )
+
+            if lesson_type_id == PRACTICE_ID:
+                for group_id in curriculum_groups:
+                    add_lessons((group_id,), subject_for_term.count)
+            elif lesson_type_id == LABORATORY_ID:
+                for group_id in curriculum_groups:
+                    add_lessons((group_id,), subject_for_term.count * 2)
+            elif lesson_type_id == LECTURE_ID:
+                add_lessons(tuple(curriculum_groups), subject_for_term.count)
+
+        terms_of_curriculum: Dict[int, Set[int]] = {}
+        for lesson in lessons:
+            terms_of_curriculum.setdefault(lesson.curriculum_id, set()).add(
+                lesson.term_number_id
+            )
+        mixed = [
+            curriculum_id
+            for curriculum_id, terms in terms_of_curriculum.items()
+            if len(terms) > 1
+        ]
+        if mixed:
+            names = session.query(Curriculum.name).filter(Curriculum.id.in_(mixed))
+            raise ValueError(
+                "Several terms of one curriculum cannot be scheduled into one week, "
+                f"select one term of: {', '.join(name for name, in names)}"
+            )
+
+        # Пустой домен иначе обрушил бы random.choice уже в фоновом потоке
+        domains.validate(
+            session, (lesson.subject_partition_id for lesson in lessons)
+        )
+
+        return cls(
+            day_ids=day_ids,
+            time_ids=time_ids,
+            curriculum_ids=curriculum_ids,
+            group_ids=group_ids,
+            teacher_ids=teacher_ids,
+            room_ids=room_ids,
+            lessons=lessons,
+        )
+
+
+def term_number_ids(session: Session, values: Iterable[str]) -> Tuple[int, ...]:
+    """Ids of the terms with the given numbers as shown to the user ("1", "2", ...)."""
+    values = {str(value).strip() for value in values}
+    terms = {
+        term.value: term.id
+        for term in session.query(TermNumber).filter(TermNumber.value.in_(values))
+    }
+    unknown = values.difference(terms)
+    if unknown:
+        raise ValueError(f"Unknown terms: {', '.join(sorted(unknown))}")
+    return tuple(sorted(terms.values()))
@@ -0,0 +1,114 @@
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .vectorized import GENE_WIDTH, GenomeEncoding, count_population_conflicts
+
+GENOME_DTYPE = np.int32
+SCORE_DTYPE = np.int64
+
+
+class SharedPopulationBuffer:
+    """
+    Genomes and scores of a vectorized population placed in shared memory blocks,
+    so that worker processes can evaluate them in place without any pickling.
+    The creating process owns the blocks and must call close().
+    """
+
+    genomes: np.ndarray
+    scores: np.ndarray
+    _genome_memory: SharedMemory
+    _score_memory: SharedMemory
+
+    def __init__(self, population_size: int, lesson_count: int):
+        genome_shape = (population_size, lesson_count, GENE_WIDTH)
+        genome_size = int(np.prod(genome_shape)) * np.dtype(GENOME_DTYPE).itemsize
+        score_size = population_size * np.dtype(SCORE_DTYPE).itemsize
+
+        self._genome_memory = SharedMemory(create=True, size=max(genome_size, 1))
+        self._score_memory = SharedMemory(create=True, size=max(score_size, 1))
+        self.genomes = np.ndarray(
+            genome_shape, dtype=GENOME_DTYPE, buffer=self._genome_memory.buf
+        )
+        self.scores = np.ndarray(
+            (population_size,), dtype=SCORE_DTYPE, buffer=self._score_memory.buf
+        )
+
+    @property
+    def description(self) -> Tuple[str, str, Tuple[int, int, int]]:
+        """What a worker needs to attach to the buffer."""
+        return self._genome_memory.name, self._score_memory.name, self.genomes.shape
+
+    def close(self):
+        del self.genomes
+        del self.scores
+        for memory in (self._genome_memory, self._score_memory):
+            memory.close()
+            memory.unlink()
+
+
+_encoding: Optional[GenomeEncoding] = None
+_memories: List[SharedMemory] = []
+_genomes: Optional[np.ndarray] = None
+_scores: Optional[np.ndarray] = None
+
+
+def _attach_worker(
+    encoding: GenomeEncoding,
+    description: Tuple[str, str, Tuple[int, int, int]],
+):
+    global _encoding, _memories, _genomes, _scores
+    genome_name, score_name, genome_shape = description
+
+    _encoding = encoding
+    _memories = [SharedMemory(name=genome_name), SharedMemory(name=score_name)]
+    _genomes = np.ndarray(genome_shape, dtype=GENOME_DTYPE, buffer=_memories[0].buf)
+    _scores = np.ndarray(
+        (genome_shape[0],), dtype=SCORE_DTYPE, buffer=_memories[1].buf
+    )
+
+
+def _evaluate_slice(start: int, stop: int):
+    teachers, rooms, groups = count_population_conflicts(
+        _encoding, _genomes[start:stop]
+    )
+    _scores[start:stop] = -(teachers + rooms + groups)
+
+
+class SharedMemoryEvaluator:
+    """
+    Evaluates slices of a SharedPopulationBuffer in a process pool. Workers attach
+    to the buffer once, on start, and write scores straight into it; only slice
+    bounds travel between processes.
+    """
+
+    _executor: ProcessPoolExecutor
+    _processes: int
+
+    def __init__(
+        self,
+        encoding: GenomeEncoding,
+        buffer: SharedPopulationBuffer,
+        processes: int,
+    ):
+        self._processes = processes
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_attach_worker,
+            initargs=(encoding, buffer.description),
+        )
+
+    def evaluate(self, start: int, stop: int):
+        chunk_size = max(1, -(-(stop - start) // self._processes))
+        futures = [
+            self._executor.submit(_evaluate_slice, i, min(i + chunk_size, stop))
+            for i in range(start, stop, chunk_size)
+        ]
+        done, _ = wait(futures)
+        for future in done:
+            future.result()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
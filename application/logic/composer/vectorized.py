@@ -0,0 +1,303 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .problem import LessonPrecursor, ProblemSnapshot
+
+DAY = 0
+TIME = 1
+TEACHER = 2
+ROOM = 3
+GENE_WIDTH = 4
+
+
+class GenomeEncoding:
+    """
+    Dense integer encoding of a ProblemSnapshot. A genome is a (lessons x 4) array of
+    day, time, teacher and room indexes; a population stacks genomes into
+    a (population x lessons x 4) array. Teachers, rooms and groups are indexed
+    globally, so slot keys of different lessons can be compared directly.
+
+    Placement domains are padded tables per distinct domain: the available slots,
+    and the teachers and rooms available at every slot, so genes are sampled from
+    available placements only.
+    """
+
+    problem: ProblemSnapshot
+    day_count: int
+    time_count: int
+    slot_count: int
+    lesson_placement: np.ndarray
+    slot_domain: np.ndarray
+    slot_domain_size: np.ndarray
+    teacher_domain: np.ndarray
+    teacher_domain_size: np.ndarray
+    room_domain: np.ndarray
+    room_domain_size: np.ndarray
+    lesson_groups: np.ndarray
+
+    def __init__(self, problem: ProblemSnapshot):
+        self.problem = problem
+        self.day_count = len(problem.day_ids)
+        self.time_count = len(problem.time_ids)
+        self.slot_count = self.day_count * self.time_count
+
+        self._teacher_index = {id_: i for i, id_ in enumerate(problem.teacher_ids)}
+        self._room_index = {id_: i for i, id_ in enumerate(problem.room_ids)}
+        self._group_index = {id_: i for i, id_ in enumerate(problem.group_ids)}
+        self._day_index = {id_: i for i, id_ in enumerate(problem.day_ids)}
+        self._time_index = {id_: i for i, id_ in enumerate(problem.time_ids)}
+
+        placements = {}
+        for lesson in problem.lessons:
+            placements.setdefault(id(lesson.placement), lesson.placement)
+        placement_index = {key: i for i, key in enumerate(placements)}
+        self.lesson_placement = np.array(
+            [placement_index[id(lesson.placement)] for lesson in problem.lessons],
+            dtype=np.int32,
+        )
+
+        slots = [
+            (day_id, time_id) for day_id in problem.day_ids for time_id in problem.time_ids
+        ]
+        slot_index = {slot: i for i, slot in enumerate(slots)}
+        self.slot_domain, self.slot_domain_size = self._pad(
+            [
+                [slot_index[slot] for slot in placement.slots]
+                for placement in placements.values()
+            ]
+        )
+        # Таблицы (домен x слот x кандидат): доступные в слоте преподаватели и аудитории
+        indexes = {}
+
+        def to_indexes(ids: Tuple[int, ...], index) -> List[int]:
+            # Слоты без ограничений разделяют один кортеж домена
+            if id(ids) not in indexes:
+                indexes[id(ids)] = (ids, [index[id_] for id_ in ids])
+            return indexes[id(ids)][1]
+
+        self.teacher_domain, self.teacher_domain_size = self._pad_slots(
+            [
+                [
+                    to_indexes(placement.teachers_at(*slot), self._teacher_index)
+                    for slot in slots
+                ]
+                for placement in placements.values()
+            ]
+        )
+        self.room_domain, self.room_domain_size = self._pad_slots(
+            [
+                [to_indexes(placement.rooms_at(*slot), self._room_index) for slot in slots]
+                for placement in placements.values()
+            ]
+        )
+        self.lesson_groups, _ = self._pad(
+            [
+                [self._group_index[id_] for id_ in lesson.group_ids]
+                for lesson in problem.lessons
+            ],
+            fill=-1,
+        )
+
+    @staticmethod
+    def _pad(rows: Sequence[Sequence[int]], fill: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        width = max((len(row) for row in rows), default=0) or 1
+        padded = np.full((len(rows), width), fill, dtype=np.int32)
+        sizes = np.zeros(len(rows), dtype=np.int32)
+        for i, row in enumerate(rows):
+            padded[i, : len(row)] = row
+            sizes[i] = len(row)
+        return padded, sizes
+
+    @classmethod
+    def _pad_slots(
+        cls, domains: Sequence[Sequence[Sequence[int]]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        rows = [row for slot_rows in domains for row in slot_rows]
+        padded, sizes = cls._pad(rows)
+        slot_count = len(domains[0]) if domains else 0
+        return (
+            padded.reshape(len(domains), slot_count, padded.shape[-1]),
+            sizes.reshape(len(domains), slot_count),
+        )
+
+    @property
+    def lesson_count(self) -> int:
+        return len(self.problem.lessons)
+
+    def sample_genes(
+        self, rng: np.random.Generator, lesson_indexes: np.ndarray
+    ) -> np.ndarray:
+        """
+        Draws random genes for the given lessons (any shape): an available slot,
+        then a teacher and a room available at it.
+        """
+        genes = np.empty(lesson_indexes.shape + (GENE_WIDTH,), dtype=np.int32)
+        placements = self.lesson_placement[lesson_indexes]
+        slot_choice = rng.integers(0, self.slot_domain_size[placements])
+        slots = self.slot_domain[placements, slot_choice]
+        genes[..., DAY] = slots // self.time_count
+        genes[..., TIME] = slots % self.time_count
+        teacher_choice = rng.integers(0, self.teacher_domain_size[placements, slots])
+        genes[..., TEACHER] = self.teacher_domain[placements, slots, teacher_choice]
+        room_choice = rng.integers(0, self.room_domain_size[placements, slots])
+        genes[..., ROOM] = self.room_domain[placements, slots, room_choice]
+        return genes
+
+    def random_population(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        lesson_indexes = np.broadcast_to(
+            np.arange(self.lesson_count), (size, self.lesson_count)
+        )
+        return self.sample_genes(rng, lesson_indexes)
+
+    def encode(self, schedule: Sequence) -> np.ndarray:
+        genome = np.empty((len(schedule), GENE_WIDTH), dtype=np.int32)
+        for i, lesson in enumerate(schedule):
+            genome[i, DAY] = self._day_index[lesson.day_id]
+            genome[i, TIME] = self._time_index[lesson.time_id]
+            genome[i, TEACHER] = self._teacher_index[lesson.teacher_id]
+            genome[i, ROOM] = self._room_index[lesson.room_id]
+        return genome
+
+    def decode(self, genome: np.ndarray) -> List[LessonPrecursor]:
+        problem = self.problem
+        return [
+            LessonPrecursor(
+                group_ids=lesson.group_ids,
+                subject_partition_id=lesson.subject_partition_id,
+                day_id=problem.day_ids[day],
+                time_id=problem.time_ids[time],
+                teacher_id=problem.teacher_ids[teacher],
+                room_id=problem.room_ids[room],
+            )
+            for lesson, (day, time, teacher, room) in zip(
+                problem.lessons, genome.tolist()
+            )
+        ]
+
+
+def _duplicates(keys: np.ndarray) -> np.ndarray:
+    """Per row, the number of keys equal to an earlier key of the same row."""
+    if keys.shape[-1] < 2:
+        return np.zeros(keys.shape[0], dtype=np.int64)
+    keys = np.sort(keys, axis=-1)
+    return np.count_nonzero(keys[:, 1:] == keys[:, :-1], axis=-1)
+
+
+def count_population_conflicts(
+    encoding: GenomeEncoding, genomes: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized counterpart of fitness.count_conflicts for a (population x lessons x 4)
+    array. Returns teacher, room and group clash counts per individual.
+    """
+    genomes = genomes.astype(np.int64, copy=False)
+    slots = genomes[..., DAY] * encoding.time_count + genomes[..., TIME]
+
+    teacher_keys = genomes[..., TEACHER] * encoding.slot_count + slots
+    room_keys = genomes[..., ROOM] * encoding.slot_count + slots
+
+    lesson_groups = encoding.lesson_groups.astype(np.int64)
+    group_keys = lesson_groups * encoding.slot_count + slots[..., None]
+    # Пустые ячейки получают уникальные отрицательные ключи и не дают совпадений
+    padding = -1 - np.arange(lesson_groups.size, dtype=np.int64).reshape(
+        lesson_groups.shape
+    )
+    group_keys = np.where(lesson_groups >= 0, group_keys, padding)
+    group_keys = group_keys.reshape(genomes.shape[0], -1)
+
+    return (
+        _duplicates(teacher_keys),
+        _duplicates(room_keys),
+        _duplicates(group_keys),
+    )
+
+
+class VectorizedPopulation:
+    """
+    The whole GA population as one integer array. Crossover, mutation and fitness
+    follow ComposerTask.crossover / mutate / check, but operate on every individual
+    at once.
+
+    Genomes and scores may be given preallocated arrays (e.g. shared memory); they
+    are always updated in place. An external evaluator with evaluate(start, stop)
+    may take over scoring of population slices. Initial genomes are random unless
+    given explicitly.
+    """
+
+    encoding: GenomeEncoding
+    genomes: np.ndarray
+    scores: np.ndarray
+
+    def __init__(
+        self,
+        encoding: GenomeEncoding,
+        size: int,
+        rng: np.random.Generator,
+        genomes: Optional[np.ndarray] = None,
+        scores: Optional[np.ndarray] = None,
+        evaluator=None,
+        initial_genomes: Optional[np.ndarray] = None,
+    ):
+        self.encoding = encoding
+        self._rng = rng
+        self._evaluator = evaluator
+
+        self.genomes = genomes if genomes is not None else np.empty(
+            (size, encoding.lesson_count, GENE_WIDTH), dtype=np.int32
+        )
+        self.scores = scores if scores is not None else np.empty(size, dtype=np.int64)
+        self.genomes[:] = (
+            initial_genomes
+            if initial_genomes is not None
+            else encoding.random_population(rng, size)
+        )
+        self._evaluate_range(0, size)
+
+    def evaluate(self, genomes: np.ndarray) -> np.ndarray:
+        teachers, rooms, groups = count_population_conflicts(self.encoding, genomes)
+        return -(teachers + rooms + groups)
+
+    def _evaluate_range(self, start: int, stop: int):
+        if self._evaluator is None:
+            self.scores[start:stop] = self.evaluate(self.genomes[start:stop])
+        else:
+            self._evaluator.evaluate(start, stop)
+
+    def sort(self):
+        order = np.argsort(-self.scores, kind="stable")
+        self.genomes[:] = self.genomes[order]
+        self.scores[:] = self.scores[order]
+
+    def crossover(self, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        mask = self._rng.random(first.shape[:2]) > 0.5
+        return np.where(mask[..., None], first, second)
+
+    def mutate(self, children: np.ndarray, mutation_rate: float):
+        rows = np.flatnonzero(self._rng.random(children.shape[0]) < mutation_rate)
+        if rows.size == 0 or self.encoding.lesson_count == 0:
+            return
+        lessons = self._rng.integers(0, self.encoding.lesson_count, rows.size)
+        children[rows, lessons] = self.encoding.sample_genes(self._rng, lessons)
+
+    def restart(self, keep: int):
+        """Replaces all but the first keep genomes with random ones."""
+        size = self.genomes.shape[0]
+        if keep < size:
+            self.genomes[keep:] = self.encoding.random_population(self._rng, size - keep)
+            self._evaluate_range(keep, size)
+
+    def next_generation(self, mutation_rate: float):
+        """Keeps the better half (population must be sorted) and breeds the rest."""
+        size = self.genomes.shape[0]
+        elite_count = max(size // 2, 2)
+        children_count = size - elite_count
+
+        if children_count > 0:
+            first = self._rng.integers(0, elite_count, children_count)
+            second = (first + self._rng.integers(1, elite_count, children_count)) % elite_count
+            children = self.crossover(self.genomes[first], self.genomes[second])
+            self.mutate(children, mutation_rate)
+
+            self.genomes[elite_count:] = children
+            self._evaluate_range(elite_count, size)
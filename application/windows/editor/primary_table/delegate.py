@@ -10,6 +10,8 @@ class ForeignKeyDelegate(QStyledItemDelegate):
 
     def createEditor(self, parent, option, index):
         combo_box = QComboBox(parent)
+        if self.foreign_key_column.nullable:
+            combo_box.addItem("", None)
         items = self.session.query(self.foreign_key_column.orm_type).all()
         for item in items:
             combo_box.addItem(self.foreign_key_column.represent(item), item)
@@ -46,7 +46,7 @@ class PrimaryTableModel(QAbstractTableModel):
             column = self.visible_columns[index.column()]
 
             if isinstance(column, ForeignKeyColumnDescription):
-                setattr(obj, column.attribute, value.id)
+                setattr(obj, column.attribute, value.id if value is not None else None)
             else:
                 setattr(obj, column.attribute, value)
 
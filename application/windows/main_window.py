@@ -10,6 +10,8 @@ from PySide6.QtWidgets import (
     QFileDialog,
     QMessageBox,
     QLineEdit,
+    QComboBox,
+    QCheckBox,
 )
 
 from ..data import Teacher, SubjectPartition, Data
@@ -22,9 +24,23 @@ from ..data import (
     Group,
     Lesson,
     SubjectTitle,
+    TeacherUnavailability,
+    RoomUnavailability,
 )
 from .message_window import MessageWindow
-from ..logic import ComposerTask
+from ..logic import (
+    ComposerTask,
+    STAGNATION_STOP,
+    STAGNATION_RESTART,
+    INITIALIZATION_RANDOM,
+    INITIALIZATION_GREEDY,
+    INITIALIZATION_COLORING,
+    ENGINE_GENETIC,
+    ENGINE_ANNEALING,
+    ENGINE_TABU,
+    ENGINE_COLORING,
+    term_number_ids,
+)
 from .progress_window import ProgressWindow
 
 
@@ -70,6 +86,7 @@ class MainWindow(QMainWindow):
                 "Аудитории": {
                     Room: "Перечень",
                     RoomGroup: "Категории",
+                    RoomUnavailability: "Занятость",
                 },
                 "Учебные планы": {
                     Curriculum: "Перечень",
@@ -82,6 +99,7 @@ class MainWindow(QMainWindow):
                     Teacher: "Преподаватели",
                     SubjectTitle: "Названия предметов",
                     SubjectPartition: "Разделение",
+                    TeacherUnavailability: "Недоступность преподавателей",
                 },
                 "Расписание": {Lesson: "Посмотреть", 1: "Составить"},
             },
@@ -91,6 +109,10 @@ class MainWindow(QMainWindow):
             "Популяция": 20,
             "Количество поколений": 100,
             "Вероятность мутации, %": 10,
+            "Процессы для оценки": 1,
+            "Количество островов": 1,
+            "Миграция каждые N поколений": 10,
+            "Бюджет локального поиска": 0,
         }
 
         self.values_group_box = QGroupBox("Параметры алгоритма")
@@ -108,6 +130,90 @@ class MainWindow(QMainWindow):
             self.text_boxes.append(box)
             self.values_layout.addLayout(line)
 
+        # Именованные параметры ComposerTask
+        options_dict = {
+            "checkpoint_interval": ("Контрольная точка каждые N поколений", 25),
+            "time_limit": ("Ограничение времени, с (0 — нет)", 0),
+            "stagnation_limit": ("Поколений без улучшения (0 — нет)", 0),
+            "seed": ("Зерно ГСЧ (пусто — случайное)", ""),
+            "subproblem_processes": ("Процессы для независимых подзадач", 1),
+        }
+
+        self.option_boxes = {}
+
+        for key, (label, value) in options_dict.items():
+            line = QHBoxLayout()
+            line.addWidget(QLabel(label), 1)
+            box = QLineEdit(str(value))
+            self.buttons.append(box)
+            line.addWidget(box, 1)
+            self.option_boxes[key] = box
+            self.values_layout.addLayout(line)
+
+        self.terms_box = QLineEdit("1")
+        self.curricula_box = QLineEdit("")
+        for label, box in (
+            ("Семестры (через пробел)", self.terms_box),
+            ("Учебные планы, id (пусто — все)", self.curricula_box),
+        ):
+            line = QHBoxLayout()
+            line.addWidget(QLabel(label), 1)
+            self.buttons.append(box)
+            line.addWidget(box, 1)
+            self.values_layout.addLayout(line)
+
+        choices = {
+            "engine": (
+                "Алгоритм",
+                {
+                    "Генетический": ENGINE_GENETIC,
+                    "Имитация отжига": ENGINE_ANNEALING,
+                    "Поиск с запретами": ENGINE_TABU,
+                    "Раскраска графа (DSATUR)": ENGINE_COLORING,
+                },
+            ),
+            "initialization": (
+                "Начальная популяция",
+                {
+                    "Случайная": INITIALIZATION_RANDOM,
+                    "Жадная (сначала сложные)": INITIALIZATION_GREEDY,
+                    "Раскраска графа (DSATUR)": INITIALIZATION_COLORING,
+                },
+            ),
+            "on_stagnation": (
+                "При застое",
+                {
+                    "Остановить": STAGNATION_STOP,
+                    "Перезапустить": STAGNATION_RESTART,
+                },
+            ),
+        }
+
+        self.combo_boxes = {}
+
+        for key, (label, items) in choices.items():
+            line = QHBoxLayout()
+            line.addWidget(QLabel(label), 1)
+            box = QComboBox()
+            for name, value in items.items():
+                box.addItem(name, value)
+            self.buttons.append(box)
+            line.addWidget(box, 1)
+            self.combo_boxes[key] = box
+            self.values_layout.addLayout(line)
+
+        self.resume_check_box = QCheckBox("Продолжить с контрольной точки")
+        self.buttons.append(self.resume_check_box)
+        self.values_layout.addWidget(self.resume_check_box)
+
+        self.metrics_check_box = QCheckBox("Замерять время этапов")
+        self.buttons.append(self.metrics_check_box)
+        self.values_layout.addWidget(self.metrics_check_box)
+
+        self.vectorized_check_box = QCheckBox("Векторизованный ГА (NumPy)")
+        self.buttons.append(self.vectorized_check_box)
+        self.values_layout.addWidget(self.vectorized_check_box)
+
         self.main_layout.addWidget(self.values_group_box)
 
         self.run_composer_button = QPushButton("Составить расписание")
@@ -174,15 +280,46 @@ class MainWindow(QMainWindow):
                 button.setEnabled(False)
 
     def _on_run_composer_button_clicked(self):
-        values = []
-        for box in self.text_boxes:
-            box: QLineEdit = box
-            values.append(float(box.text().replace(",", ".")))
+        try:
+            values = []
+            for box in self.text_boxes:
+                box: QLineEdit = box
+                values.append(float(box.text().replace(",", ".")))
+
+            values[2] = values[2] / 100
+            print(values)
+
+            options = {
+                key: float(box.text().replace(",", "."))
+                for key, box in self.option_boxes.items()
+                if box.text().strip()
+            }
+            options.update(
+                {key: box.currentData() for key, box in self.combo_boxes.items()}
+            )
+
+            with self._data.get_session() as session:
+                options["term_number_ids"] = term_number_ids(
+                    session, self.terms_box.text().replace(",", " ").split()
+                )
+            curricula = self.curricula_box.text().replace(",", " ").split()
+            if curricula:
+                options["curriculum_ids"] = [
+                    int(curriculum) for curriculum in curricula
+                ]
 
-        values[2] = values[2] / 100
-        print(values)
+            task = ComposerTask(
+                self._data,
+                *values,
+                resume=self.resume_check_box.isChecked(),
+                metrics=self.metrics_check_box.isChecked(),
+                vectorized=self.vectorized_check_box.isChecked(),
+                **options,
+            )
+        except (ValueError, OverflowError) as error:
+            QMessageBox.critical(self, "Ошибка", str(error))
+            return
 
-        task = ComposerTask(self._data, *values)
         self._progress_window = ProgressWindow(self, task)
         self._progress_window.on_task_finish
         self._progress_window.show()
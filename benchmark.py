@@ -0,0 +1,237 @@
+"""
+Composer benchmark: times ComposerTask phases on generated fixed-seed databases of
+increasing size, writes the results to JSON and compares them with a baseline.
+Runs without Qt.
+
+    python benchmark.py --scales 1 2 4 8 --output bench.json
+    python benchmark.py --baseline bench.json --tolerance 0.25
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, List, Tuple
+
+from application.data import GeneratorParameters, generate_database
+from application.logic import ComposerTask
+from application.logic.composer.engines import GeneticEngine
+from application.logic.composer.fitness import count_conflicts
+
+PHASES = (
+    "load",
+    "create_new_schedule",
+    "check",
+    "crossover",
+    "mutate",
+    "generation",
+    "save_to_db",
+)
+
+
+def dataset_parameters(scale: int) -> GeneratorParameters:
+    return GeneratorParameters(
+        curricula=5 * scale,
+        groups_per_curriculum=4,
+        subject_partitions=30 * scale,
+        teachers_per_subject=2,
+        room_groups=4,
+        rooms=20 * scale,
+    )
+
+
+def milliseconds_per_call(function: Callable[[], Any], calls: int, repeat: int) -> float:
+    """Mean time of a call, best of repeat rounds to keep noise out of comparisons."""
+    best = None
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000 / calls
+
+
+def benchmark_dataset(path: str, scale: int, arguments) -> Dict[str, Any]:
+    data, rows = generate_database(
+        path, dataset_parameters(scale), arguments.seed, overwrite=True
+    )
+    task = ComposerTask(
+        data,
+        arguments.population,
+        arguments.generations,
+        arguments.mutation_rate,
+        seed=arguments.seed,
+    )
+    phases: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    problem = task.load_problem()
+    phases["load"] = (time.perf_counter() - start) * 1000
+
+    calls, repeat = arguments.population, arguments.repeat
+    phases["create_new_schedule"] = milliseconds_per_call(
+        task.create_new_schedule, calls, repeat
+    )
+    schedules = [task.create_new_schedule() for _ in range(calls)]
+    rng = random.Random(arguments.seed)
+    phases["check"] = milliseconds_per_call(
+        lambda: task.check(rng.choice(schedules)), calls, repeat
+    )
+    phases["crossover"] = milliseconds_per_call(
+        lambda: task.crossover(*rng.sample(schedules, 2)), calls, repeat
+    )
+    phases["mutate"] = milliseconds_per_call(
+        lambda: task.mutate(list(rng.choice(schedules))), calls, repeat
+    )
+
+    def solve() -> Tuple[List, int, float]:
+        """The best schedule, the generation count and the mean generation time."""
+        reported = []
+
+        def report(message: str):
+            if message.startswith("Generation"):
+                reported.append(time.perf_counter())
+
+        engine = GeneticEngine(
+            arguments.population,
+            arguments.generations,
+            arguments.mutation_rate,
+            rng=random.Random(arguments.seed),
+        )
+        start = time.perf_counter()
+        best = engine.solve(problem, report)
+        if len(reported) > 1:
+            # От первого отчёта до последнего: создание популяции не учитывается
+            generation = (reported[-1] - reported[0]) / (len(reported) - 1)
+        else:
+            generation = time.perf_counter() - start
+        return best, len(reported), generation * 1000
+
+    best_schedule, generations, phases["generation"] = solve()
+
+    peak_memory = None
+    if arguments.memory:
+        tracemalloc.start()
+        solve()
+        peak_memory = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+
+    start = time.perf_counter()
+    task.save_to_db(best_schedule)
+    phases["save_to_db"] = (time.perf_counter() - start) * 1000
+
+    return {
+        "scale": scale,
+        "rows": rows,
+        "lessons": len(problem),
+        "generations": generations,
+        "phases_ms": {phase: round(phases[phase], 4) for phase in PHASES},
+        "peak_memory_kb": peak_memory,
+        "final_conflicts": count_conflicts(best_schedule).total,
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Phases, memory and conflicts that got worse than baseline * (1 + tolerance)."""
+    regressions = []
+    baseline_datasets = {dataset["scale"]: dataset for dataset in baseline["datasets"]}
+    for dataset in results["datasets"]:
+        reference = baseline_datasets.get(dataset["scale"])
+        if reference is None:
+            continue
+
+        measures = [
+            (f"{phase} ms", dataset["phases_ms"][phase], reference["phases_ms"].get(phase))
+            for phase in PHASES
+        ]
+        measures.append(
+            ("peak memory kB", dataset["peak_memory_kb"], reference.get("peak_memory_kb"))
+        )
+        for name, value, old in measures:
+            if value is not None and old and value > old * (1 + tolerance):
+                regressions.append(
+                    f"scale {dataset['scale']}: {name} {value:g} > {old:g} "
+                    f"(+{value / old - 1:.0%})"
+                )
+        if dataset["final_conflicts"] > reference["final_conflicts"]:
+            regressions.append(
+                f"scale {dataset['scale']}: conflicts "
+                f"{dataset['final_conflicts']} > {reference['final_conflicts']}"
+            )
+    return regressions
+
+
+def print_table(results: Dict[str, Any]):
+    header = f"{'lessons':>8} {'rows':>8}" + "".join(f"{phase:>20}" for phase in PHASES)
+    print(header + f"{'peak kB':>10}{'conflicts':>10}")
+    for dataset in results["datasets"]:
+        line = f"{dataset['lessons']:>8} {dataset['rows']:>8}" + "".join(
+            f"{dataset['phases_ms'][phase]:>20.3f}" for phase in PHASES
+        )
+        peak = dataset["peak_memory_kb"]
+        print(line + f"{'-' if peak is None else peak:>10}{dataset['final_conflicts']:>10}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Composer benchmark")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--population", type=int, default=20)
+    parser.add_argument("--generations", type=int, default=10)
+    parser.add_argument("--mutation-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="rounds of per-call timings")
+    parser.add_argument("--no-memory", dest="memory", action="store_false")
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--baseline", help="JSON results to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    arguments = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = {
+        "parameters": {
+            "population": arguments.population,
+            "generations": arguments.generations,
+            "mutation_rate": arguments.mutation_rate,
+            "seed": arguments.seed,
+            "repeat": arguments.repeat,
+        },
+        "datasets": [],
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in arguments.scales:
+            path = os.path.join(directory, f"benchmark-{scale}.db")
+            # ComposerTask печатает расписание, в замерах это не нужно
+            with redirect_stdout(io.StringIO()):
+                results["datasets"].append(benchmark_dataset(path, scale, arguments))
+
+    print_table(results)
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            regressions = compare(results, json.load(file), arguments.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(
+            f"No regressions against {arguments.baseline} "
+            f"(tolerance {arguments.tolerance:.0%})"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,185 @@
-from application import ComposerTask
+"""
+Headless batch composer: schedules every given database in a pool of worker
+processes, saves the results into the databases and prints one JSON line per file.
 
-composer_task = ComposerTask("curriculum", "", 20, 20, 0.1)
-composer_task.execute()
\ No newline at end of file
+    python composer.py dept1.db dept2.db --generations 500 --seed 1 --time-limit 60
+    python composer.py dept.db --terms 1 3 5 7 --subproblem-processes 4
+    python composer.py dept.db --generations 5000 --checkpoint-interval 50 --resume
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List
+
+from application.data import Data
+from application.logic import (
+    ComposerTask,
+    ENGINE_ANNEALING,
+    ENGINE_COLORING,
+    ENGINE_GENETIC,
+    ENGINE_TABU,
+    INITIALIZATION_COLORING,
+    INITIALIZATION_GREEDY,
+    INITIALIZATION_RANDOM,
+    STAGNATION_RESTART,
+    STAGNATION_STOP,
+    term_number_ids,
+)
+from application.logic.composer.fitness import count_conflicts
+
+
+def compose(
+    path: str, options: Dict[str, Any], terms: List[str], verbose: bool
+) -> Dict[str, Any]:
+    """Schedules one database for the terms with the given numbers; runs in a worker process."""
+    if not verbose:
+        logging.disable(logging.WARNING)
+
+    start = time.monotonic()
+    summary: Dict[str, Any] = {"path": path}
+    try:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(path)
+
+        data = Data(path)
+        data.path = path
+        with data.get_session() as session:
+            term_ids = term_number_ids(session, terms)
+        task = ComposerTask(
+            data, print_result=False, term_number_ids=term_ids, **options
+        )
+        result = task.execute()
+
+        conflicts = count_conflicts(task.best_schedule)
+        summary.update(
+            status="ok",
+            seed=task.seed,
+            fitness=conflicts.score,
+            teacher_conflicts=conflicts.teacher_conflicts,
+            room_conflicts=conflicts.room_conflicts,
+            group_conflicts=conflicts.group_conflicts,
+            lessons=len(task.best_schedule),
+        )
+        report = task.save_report
+        if report is not None:
+            summary.update(saved_rows=report.rows, changed_rows=report.changed)
+        if result.value is not None:
+            summary["metrics"] = result.value.as_dict()
+    except Exception as error:
+        summary.update(status="error", error=f"{type(error).__name__}: {error}")
+
+    summary["seconds"] = round(time.monotonic() - start, 3)
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Composes schedules for database files")
+    parser.add_argument("databases", nargs="+", help=".db files to schedule")
+    parser.add_argument("--population", type=int, default=20)
+    parser.add_argument("--generations", type=int, default=100)
+    parser.add_argument("--mutation-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, help="the same seed for every file")
+    parser.add_argument("--time-limit", type=float, default=0, help="seconds per file")
+    parser.add_argument("--stagnation-limit", type=int, default=0)
+    parser.add_argument(
+        "--on-stagnation",
+        choices=(STAGNATION_STOP, STAGNATION_RESTART),
+        default=STAGNATION_STOP,
+    )
+    parser.add_argument(
+        "--engine",
+        choices=(ENGINE_GENETIC, ENGINE_ANNEALING, ENGINE_TABU, ENGINE_COLORING),
+        default=ENGINE_GENETIC,
+    )
+    parser.add_argument(
+        "--initialization",
+        choices=(INITIALIZATION_RANDOM, INITIALIZATION_GREEDY, INITIALIZATION_COLORING),
+        default=INITIALIZATION_RANDOM,
+    )
+    parser.add_argument("--local-search", type=int, default=0, help="min-conflicts budget")
+    parser.add_argument(
+        "--processes", type=int, default=1, help="fitness evaluation processes per file"
+    )
+    parser.add_argument("--islands", type=int, default=1, help="GA island count")
+    parser.add_argument(
+        "--migration-interval",
+        type=int,
+        default=10,
+        help="generations between island migrations",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=int,
+        default=0,
+        help="save a GA checkpoint next to every file each N generations (0: never)",
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="continue from the files' checkpoints"
+    )
+    parser.add_argument(
+        "--vectorized", action="store_true", help="NumPy population for the GA"
+    )
+    parser.add_argument(
+        "--terms",
+        nargs="+",
+        default=["1"],
+        help="numbers of the terms to schedule, at most one per curriculum",
+    )
+    parser.add_argument(
+        "--curricula", type=int, nargs="+", help="ids of the curricula (default: all)"
+    )
+    parser.add_argument(
+        "--subproblem-processes",
+        type=int,
+        default=1,
+        help="processes for independent subproblems of every file",
+    )
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--metrics", action="store_true", help="include phase timings")
+    parser.add_argument("--verbose", action="store_true", help="log composer progress")
+    arguments = parser.parse_args()
+
+    options = {
+        "population_size": arguments.population,
+        "generations_count": arguments.generations,
+        "mutation_rate": arguments.mutation_rate,
+        "local_search_budget": arguments.local_search,
+        "processes": arguments.processes,
+        "islands": arguments.islands,
+        "migration_interval": arguments.migration_interval,
+        "vectorized": arguments.vectorized,
+        "checkpoint_interval": arguments.checkpoint_interval,
+        "resume": arguments.resume,
+        "initialization": arguments.initialization,
+        "engine": arguments.engine,
+        "time_limit": arguments.time_limit,
+        "stagnation_limit": arguments.stagnation_limit,
+        "on_stagnation": arguments.on_stagnation,
+        "seed": arguments.seed,
+        "metrics": arguments.metrics,
+        "curriculum_ids": arguments.curricula,
+        "subproblem_processes": arguments.subproblem_processes,
+    }
+
+    failed = 0
+    jobs = max(min(arguments.jobs or 1, len(arguments.databases)), 1)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(compose, path, options, arguments.terms, arguments.verbose)
+            for path in arguments.databases
+        ]
+        for future in as_completed(futures):
+            summary = future.result()
+            failed += summary["status"] != "ok"
+            print(json.dumps(summary, ensure_ascii=False), flush=True)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+import argparse
+import time
+
+from application.data import GeneratorParameters, generate_database
+
+parser = argparse.ArgumentParser(description="Generates a synthetic curriculum database")
+parser.add_argument("path")
+parser.add_argument("--curricula", type=int, default=10)
+parser.add_argument("--groups", type=int, default=4, help="groups per curriculum")
+parser.add_argument("--subjects", type=int, default=60, help="subject partitions")
+parser.add_argument("--teachers-per-subject", type=int, default=2)
+parser.add_argument("--room-groups", type=int, default=4)
+parser.add_argument("--rooms", type=int, default=40)
+parser.add_argument("--lessons", type=int, nargs=2, default=(1, 2), metavar=("MIN", "MAX"))
+parser.add_argument("--tightness", type=float, default=0.7, help="lessons per available slot")
+parser.add_argument("--seed", type=int, default=0)
+parser.add_argument("--overwrite", action="store_true")
+arguments = parser.parse_args()
+
+start = time.monotonic()
+_, rows = generate_database(
+    arguments.path,
+    GeneratorParameters(
+        arguments.curricula,
+        arguments.groups,
+        arguments.subjects,
+        arguments.teachers_per_subject,
+        arguments.room_groups,
+        arguments.rooms,
+        tuple(arguments.lessons),
+        arguments.tightness,
+    ),
+    arguments.seed,
+    arguments.overwrite,
+)
+print(f"{arguments.path}: {rows} rows in {time.monotonic() - start:.2f} s")
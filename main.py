@@ -1,3 +1,8 @@
+import multiprocessing
+
 from application import Application
 
-Application().start()
\ No newline at end of file
+if __name__ == "__main__":
+    # Дочерние процессы пулов заново импортируют этот модуль при spawn
+    multiprocessing.freeze_support()
+    Application().start()